@@ -8,7 +8,6 @@
 import os
 import json
 from typing import Dict, Any
-from pathlib import Path
 
 
 class ConfigManager:
@@ -19,6 +18,10 @@ class ConfigManager:
         self.config_dir = os.path.dirname(config_file)
         self._ensure_config_dir()
         self._config = self._load_default_config()
+        # 扩展名到分类的索引缓存，配置变化时清空，下次使用时重建
+        self._extension_index = None
+        # 最近一次写入文件的配置内容，内容未变化时跳过写入
+        self._saved_text = None
         self.load_config()
     
     def _ensure_config_dir(self):
@@ -77,7 +80,9 @@ class ConfigManager:
             "monitor_settings": {
                 "enabled": True,
                 "delay": 1,  # 文件创建后等待时间（秒）
-                "recursive": False  # 是否递归监控子目录
+                "recursive": False,  # 是否递归监控子目录
+                "use_polling_observer": False,  # 是否强制使用轮询方式监控（网络驱动器会自动启用）
+                "polling_interval": 5  # 轮询间隔（秒）
             },
             
             # 日志设置
@@ -108,6 +113,7 @@ class ConfigManager:
                 "hash_algorithm": "md5",  # 哈希算法
                 "chunk_size": 4096,  # 读取文件的块大小
                 "max_hash_file_size": 1048576,  # 最大哈希文件大小（1MB）
+                "max_duplicate_hash_size": 2147483648,  # 查找重复文件时逐字节核对的文件大小上限（2GB）
                 "preserve_timestamps": True,  # 是否保留文件时间戳
                 "create_shortcuts": False  # 是否创建快捷方式而不是移动文件
             }
@@ -118,9 +124,13 @@ class ConfigManager:
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    file_config = json.load(f)
-                    # 合并配置，文件配置覆盖默认配置
-                    self._merge_config(self._config, file_config)
+                    text = f.read()
+                file_config = json.loads(text)
+                # 合并配置，文件配置覆盖默认配置
+                self._merge_config(self._config, file_config)
+                self._extension_index = None
+                # 记录文件中的原始内容，保存时内容相同则无需重写
+                self._saved_text = text
         except Exception as e:
             print(f"加载配置文件失败: {e}，使用默认配置")
         
@@ -131,9 +141,33 @@ class ConfigManager:
         try:
             if config is not None:
                 self._config = config
+                self._extension_index = None
+            
+            return self.write_config_text(self.serialize_config())
+        except Exception as e:
+            print(f"保存配置文件失败: {e}")
+            return False
+    
+    def serialize_config(self) -> str:
+        """将当前配置序列化为JSON文本
+        
+        需要在修改配置的线程中调用，得到的文本可以交给其他线程写入文件
+        """
+        return json.dumps(self._config, ensure_ascii=False, indent=2)
+    
+    def write_config_text(self, text: str) -> bool:
+        """将已序列化的配置文本写入文件
+        
+        不访问配置字典，可以在后台线程中调用；
+        内容与上次写入的相同且文件仍然存在时，无需重复写入
+        """
+        try:
+            if text == self._saved_text and os.path.exists(self.config_file):
+                return True
             
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, ensure_ascii=False, indent=2)
+                f.write(text)
+            self._saved_text = text
             return True
         except Exception as e:
             print(f"保存配置文件失败: {e}")
@@ -168,6 +202,7 @@ class ConfigManager:
         
         # 设置值
         config[keys[-1]] = value
+        self._extension_index = None
     
     def _merge_config(self, base: Dict, override: Dict):
         """递归合并配置字典"""
@@ -190,11 +225,13 @@ class ConfigManager:
             normalized_extensions.append(ext.lower())
         
         self._config["file_types"][category] = normalized_extensions
+        self._extension_index = None
     
     def remove_file_type_rule(self, category: str):
         """删除文件类型规则"""
         if "file_types" in self._config and category in self._config["file_types"]:
             del self._config["file_types"][category]
+            self._extension_index = None
     
     def get_file_categories(self) -> list:
         """获取所有文件分类"""
@@ -204,6 +241,27 @@ class ConfigManager:
         """获取指定分类的文件扩展名"""
         return self._config.get("file_types", {}).get(category, [])
     
+    @staticmethod
+    def build_extension_index(file_types: Dict[str, list]) -> Dict[str, str]:
+        """根据分类规则构建扩展名到分类的映射
+        
+        键为小写且不带点的扩展名；同一扩展名出现在多个分类中时，以第一个分类为准
+        """
+        index = {}
+        for category, extensions in file_types.items():
+            for ext in extensions:
+                index.setdefault(ext.lstrip('.').lower(), category)
+        return index
+    
+    def get_extension_index(self) -> Dict[str, str]:
+        """获取当前配置的扩展名到分类的映射
+        
+        映射按需构建并缓存，配置变化后自动重建
+        """
+        if self._extension_index is None:
+            self._extension_index = self.build_extension_index(self._config.get("file_types", {}))
+        return self._extension_index
+    
     def add_recent_path(self, path_type: str, path: str):
         """添加最近使用的路径"""
         if "recent_paths" not in self._config:
@@ -266,6 +324,7 @@ class ConfigManager:
     def reset_to_default(self):
         """重置为默认配置"""
         self._config = self._load_default_config()
+        self._extension_index = None
     
     def export_config(self, file_path: str) -> bool:
         """导出配置到指定文件"""
@@ -286,6 +345,7 @@ class ConfigManager:
             # 验证导入的配置
             temp_config = self._config.copy()
             self._config = imported_config
+            self._extension_index = None
             errors = self.validate_config()
             
             if errors:
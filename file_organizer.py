@@ -8,9 +8,9 @@
 import os
 import shutil
 import hashlib
+import threading
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
 
 class FileOrganizer:
@@ -20,35 +20,48 @@ class FileOrganizer:
         self.config_manager = config_manager
         self.logger = logger
         
-    def organize_folder(self, source_dir: str, target_dir: str) -> Dict[str, int]:
+    def organize_folder(self, source_dir: str, target_dir: str,
+                        stop_event: Optional[threading.Event] = None) -> Dict[str, int]:
         """
         整理文件夹中的所有文件
         
         Args:
             source_dir: 源文件夹路径
             target_dir: 目标文件夹路径
+            stop_event: 可选的停止信号，设置后不再处理剩余文件
             
         Returns:
             包含处理结果统计的字典
         """
         result = {'total': 0, 'success': 0, 'failed': 0, 'skipped': 0}
         
+        # 整理过程中配置不会变化，只获取一次，供每个文件复用
+        config = self.config_manager.get_config()
+        
         try:
             # 确保目标目录存在
             os.makedirs(target_dir, exist_ok=True)
             
             # 只遍历源目录中的直接文件，不递归进入子目录
+            # 先取出全部目录项再移动文件，避免边遍历边修改目录
             try:
-                items = os.listdir(source_dir)
+                with os.scandir(source_dir) as it:
+                    entries = list(it)
             except PermissionError:
                 self.logger.error(f"无权限访问目录: {source_dir}")
                 return result
             
-            for item in items:
-                item_path = os.path.join(source_dir, item)
+            for entry in entries:
+                # 收到停止信号时中止整理
+                if stop_event is not None and stop_event.is_set():
+                    self.logger.info(f"整理已中止: {source_dir}")
+                    break
+                    
+                item = entry.name
+                item_path = entry.path
                 
-                # 只处理文件，跳过目录
-                if os.path.isfile(item_path):
+                # 只处理文件，跳过目录（scandir已缓存文件类型，无需额外stat）
+                if entry.is_file():
                     result['total'] += 1
                     
                     try:
@@ -58,7 +71,7 @@ class FileOrganizer:
                             continue
                             
                         # 整理单个文件
-                        organized_path = self.organize_file(item_path, target_dir)
+                        organized_path = self.organize_file(item_path, target_dir, config)
                         if organized_path:
                             result['success'] += 1
                             self.logger.info(f"文件已整理: {item} -> {organized_path}")
@@ -78,26 +91,29 @@ class FileOrganizer:
             
         return result
     
-    def organize_file(self, file_path: str, target_dir: str) -> Optional[str]:
+    def organize_file(self, file_path: str, target_dir: str,
+                      config: Optional[Dict] = None) -> Optional[str]:
         """
         整理单个文件
         
         Args:
             file_path: 文件路径
             target_dir: 目标目录
+            config: 可选的配置字典，批量整理时由调用方传入以免重复获取
             
         Returns:
             整理后的文件路径，如果跳过则返回None
         """
         try:
-            if not os.path.exists(file_path) or not os.path.isfile(file_path):
+            # isfile 对不存在的路径同样返回False，一次stat即可完成检查
+            if not os.path.isfile(file_path):
                 return None
                 
             # 获取文件信息
             file_info = self._get_file_info(file_path)
             
             # 确定目标分类目录
-            category_dir = self._determine_category_dir(file_info, target_dir)
+            category_dir = self._determine_category_dir(file_info, target_dir, config)
             
             # 创建目标目录
             os.makedirs(category_dir, exist_ok=True)
@@ -139,18 +155,21 @@ class FileOrganizer:
             'accessed_time': datetime.fromtimestamp(file_stat.st_atime)
         }
     
-    def _determine_category_dir(self, file_info: Dict, target_dir: str) -> str:
+    def _determine_category_dir(self, file_info: Dict, target_dir: str,
+                                config: Optional[Dict] = None) -> str:
         """
         确定文件的分类目录
         
         Args:
             file_info: 文件信息
             target_dir: 目标根目录
+            config: 可选的配置字典，未提供时从配置管理器获取
             
         Returns:
             分类目录路径
         """
-        config = self.config_manager.get_config()
+        if config is None:
+            config = self.config_manager.get_config()
         
         # 根据文件扩展名确定分类
         category = self._get_file_category(file_info['extension'], config)
@@ -173,15 +192,16 @@ class FileOrganizer:
         Returns:
             文件分类名称
         """
+        # 通过扩展名索引直接查找分类，无需逐个遍历分类规则；
+        # 传入的配置使用的就是当前分类规则时复用配置管理器缓存的索引，否则按传入的规则构建
         file_types = config.get('file_types', {})
-        
-        # 移除扩展名前的点
-        ext = extension.lstrip('.')
-        
-        # 查找匹配的分类
-        for category, extensions in file_types.items():
-            if ext in [e.lstrip('.') for e in extensions]:
-                return category
+        if file_types is self.config_manager.get_setting('file_types'):
+            ext_index = self.config_manager.get_extension_index()
+        else:
+            ext_index = self.config_manager.build_extension_index(file_types)
+        category = ext_index.get(extension.lstrip('.').lower())
+        if category is not None:
+            return category
         
         # 如果没有找到匹配的分类，返回默认分类
         return config.get('default_category', '其他文件')
@@ -299,16 +319,17 @@ class FileOrganizer:
         
         try:
             # 只统计指定目录中的直接文件，不递归进入子目录
-            items = os.listdir(directory)
-            for item in items:
-                item_path = os.path.join(directory, item)
+            with os.scandir(directory) as it:
+                entries = list(it)
+            for entry in entries:
+                item = entry.name
                 
                 # 只处理文件，跳过目录
-                if os.path.isfile(item_path):
+                if entry.is_file():
                     if item.startswith('.') or item.startswith('~'):
                         continue
                         
-                    file_stat = os.stat(item_path)
+                    file_stat = entry.stat()
                     
                     stats['total_files'] += 1
                     stats['total_size'] += file_stat.st_size
@@ -346,22 +367,25 @@ class FileOrganizer:
             预览结果列表
         """
         preview_results = []
+        config = self.config_manager.get_config()
         
         try:
             # 只预览指定目录中的直接文件，不递归进入子目录
-            items = os.listdir(source_dir)
-            for item in items:
-                item_path = os.path.join(source_dir, item)
+            with os.scandir(source_dir) as it:
+                entries = list(it)
+            for entry in entries:
+                item = entry.name
+                item_path = entry.path
                 
                 # 只处理文件，跳过目录
-                if os.path.isfile(item_path):
+                if entry.is_file():
                     if item.startswith('.') or item.startswith('~'):
                         continue
                         
                     file_info = self._get_file_info(item_path)
                     
                     # 确定目标分类目录
-                    category_dir = self._determine_category_dir(file_info, target_dir)
+                    category_dir = self._determine_category_dir(file_info, target_dir, config)
                     relative_category = os.path.relpath(category_dir, target_dir)
                     
                     preview_results.append({
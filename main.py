@@ -13,34 +13,151 @@
 
 # 标准库导入
 import os  # 操作系统接口，用于文件和目录操作
-import sys  # 系统特定的参数和函数
-import json  # JSON数据处理
-import shutil  # 高级文件操作工具
+import hashlib  # 哈希计算，用于查找重复文件
+import tempfile  # 获取系统临时文件夹
+import ctypes  # 调用Windows系统API（清空回收站）
+import re  # 校验规则中的扩展名
 import logging  # 日志记录功能
-import argparse  # 命令行参数解析
+from collections import Counter, deque  # 计数器和双端队列（用于文件类型统计和缓冲界面日志）
 from datetime import datetime  # 日期时间处理
-from pathlib import Path  # 面向对象的文件系统路径
-from typing import Dict, List, Optional  # 类型提示
+from itertools import chain  # 串联多个可迭代对象
+from urllib.parse import unquote  # URL解码，用于解析资源管理器窗口位置
 
 # GUI相关库导入
 import tkinter as tk  # Python标准GUI库
 from tkinter import ttk, filedialog, messagebox  # tkinter的增强组件和对话框
 import threading  # 多线程支持
+import queue  # 线程安全队列，用于合并通知
+from concurrent.futures import ThreadPoolExecutor, CancelledError  # 线程池，用于后台初始化和并行读取文件
+from contextlib import contextmanager  # 管理可在退出时取消的线程池
+import time  # 单调时钟，用于定时提醒
+import random  # 为定时提醒间隔加入随机抖动
 
-# 系统托盘和图像处理库
-import pystray  # 系统托盘图标支持
-from PIL import Image, ImageDraw  # 图像处理库
+# 可选依赖：xxhash提供比BLAKE2b更快的非加密哈希，未安装时使用标准库
+try:
+    import xxhash  # 查找重复文件时计算文件哈希
+except ImportError:
+    xxhash = None
 
-# Windows系统API
-import win32gui  # Windows GUI API
-import win32process  # Windows进程API
-import psutil  # 系统和进程工具
+# 系统托盘（pystray、PIL）和Windows系统API（pywin32、psutil）导入较慢，
+# 且只在托盘和活动窗口检测功能中用到，因此在对应方法内按需导入
 
 # 自定义模块导入
 from file_organizer import FileOrganizer  # 文件整理核心功能
 from config_manager import ConfigManager  # 配置管理
 from logger_setup import setup_logger  # 日志设置
 
+# 查找重复文件时参与哈希核对的单个文件大小上限（默认2GB）
+MAX_HASH_BYTES = 2 * 1024 ** 3
+
+# 定时提醒间隔（秒）
+REMINDER_INTERVAL = 2 * 60 * 60
+# 定时提醒间隔的随机抖动比例（±5%），避免与其他周期任务同时触发
+REMINDER_JITTER = 0.05
+
+# 常用目录存在性检查结果的缓存时间（秒）
+PATH_EXISTS_TTL = 60
+
+# 资源管理器窗口位置URL的本地文件前缀
+FILE_URI_PREFIX = 'file:///'
+
+# 资源管理器窗口的窗口类名
+EXPLORER_WINDOW_CLASSES = ("CabinetWClass", "ExploreWClass")
+
+# 界面使用的自定义ttk主题名称
+MODERN_THEME_NAME = 'fileorganizer'
+
+# 文件夹名中不允许出现的字符
+INVALID_FOLDER_NAME_CHARS = '<>|?*"'
+
+# 日志文本框最多保留的行数，超出后从顶部删除旧日志
+MAX_LOG_LINES = 2000
+# 超出上限时一次多删除的行数，避免达到上限后每次写入都要删除
+LOG_TRIM_LINES = 500
+# 日志缓冲写入文本框的间隔（毫秒），约每秒30次
+LOG_FLUSH_INTERVAL_MS = 33
+
+# 计算文件哈希时每次读取的块大小（1MB）
+HASH_CHUNK_SIZE = 1 << 20
+
+# 查找重复文件时先比较的文件头部字节数
+HASH_HEAD_BYTES = 4096
+
+# 文件监控事件的防抖间隔（秒）：最后一个事件之后静默这么久才输出日志
+MONITOR_DEBOUNCE = 0.2
+# 文件监控事件的最长等待时间（秒）：持续有事件时也至少每隔这么久输出一次
+MONITOR_MAX_LATENCY = 1.0
+
+# 托盘图标绘制代码的版本号，修改图标绘制方式时需要递增，使旧的磁盘缓存失效
+TRAY_ICON_VERSION = 1
+# 托盘图标的磁盘缓存，下次启动时直接读取，无需重新绘制；
+# 保存在用户数据目录（没有时使用系统临时文件夹）中，不写入程序的配置目录
+TRAY_ICON_CACHE = os.path.join(os.environ.get('APPDATA') or tempfile.gettempdir(),
+                               f"FileOrganizer_tray_icon_v{TRAY_ICON_VERSION}.png")
+
+# SHEmptyRecycleBinW 标志：不确认 | 不显示进度 | 不播放声音
+SHERB_SILENT = 0x1 | 0x2 | 0x4
+# SHEmptyRecycleBinW 在回收站已经为空时返回的 E_UNEXPECTED
+E_UNEXPECTED = 0x8000FFFF
+
+# 清理临时文件时并行删除的线程数
+TEMP_CLEAN_WORKERS = 16
+
+# 规则中扩展名的分隔符：逗号及其两侧的空白
+EXTENSION_SPLIT_RE = re.compile(r'\s*,\s*')
+# 合法的扩展名：可选的前导点，后接字母、数字、下划线或连字符，允许多段（如 .tar.gz）
+EXTENSION_RE = re.compile(r'\.?[\w-]+(?:\.[\w-]+)*')
+
+# 常见的垃圾文件扩展名
+JUNK_EXTENSIONS = frozenset({".tmp", ".temp", ".log", ".bak", ".old"})
+# 常见的垃圾文件名（包含macOS的垃圾文件），统一使用小写比较
+JUNK_NAMES = frozenset({"thumbs.db", "desktop.ini", ".ds_store"})
+
+
+def is_junk_file_name(name):
+    """判断文件名是否为常见的垃圾文件
+    
+    使用集合查找代替逐个通配符匹配，大小写不敏感；
+    与通配符一致，以点开头的文件名不按扩展名匹配
+    
+    Args:
+        name (str): 文件名
+        
+    Returns:
+        bool: 是垃圾文件返回True，否则返回False
+    """
+    name = name.lower()
+    if name in JUNK_NAMES:
+        return True
+    dot_idx = name.rfind('.')
+    return dot_idx > 0 and name[dot_idx:] in JUNK_EXTENSIONS
+
+
+def iter_junk_files(root):
+    """遍历目录（不递归），逐个产出其中的垃圾文件
+    
+    Args:
+        root (str): 要扫描的目录
+        
+    Yields:
+        tuple: (文件路径, 文件大小)
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        # 忽略无法访问的目录，不影响其他目录的扫描
+        return
+    with entries:
+        for entry in entries:
+            if not is_junk_file_name(entry.name):
+                continue
+            try:
+                if entry.is_file():
+                    yield entry.path, entry.stat().st_size
+            except OSError:
+                # 忽略扫描期间被删除或无法访问的文件
+                continue
+
 
 class FileOrganizerGUI:
     """文件整理工具图形界面类
@@ -58,6 +175,13 @@ class FileOrganizerGUI:
         
         创建主窗口，初始化所有组件和变量
         """
+        # 在后台线程中初始化核心组件（读取配置、创建日志），与界面创建同时进行
+        # 首次访问 config_manager / logger / organizer 时会等待初始化完成，
+        # 界面创建完成后也会等待一次，初始化失败时在启动阶段就抛出异常
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._backend_future = executor.submit(self._init_backend)
+        executor.shutdown(wait=False)
+        
         # 创建主窗口
         self.root = tk.Tk()  # 创建tkinter主窗口对象
         self.root.title("🗂️ 智能文件整理工具")  # 设置窗口标题
@@ -67,14 +191,10 @@ class FileOrganizerGUI:
         # 设置现代化主题样式
         self.setup_modern_theme()
         
-        # 初始化核心组件
-        self.config_manager = ConfigManager()  # 配置管理器，处理用户设置
-        self.logger = setup_logger()  # 日志记录器，记录操作日志
-        self.organizer = FileOrganizer(self.config_manager, self.logger)  # 文件整理器核心
-        
         # 定时提醒功能相关变量
         self.reminder_timer = None  # 定时器对象，用于定时提醒
         self.reminder_enabled = False  # 提醒功能开关状态
+        self._next_reminder_ts = None  # 下一次提醒的目标时间（time.monotonic）
         
         # GUI界面变量
         self.folder_var = tk.StringVar()  # 存储用户选择的文件夹路径
@@ -82,11 +202,53 @@ class FileOrganizerGUI:
         
         # 系统托盘功能相关变量
         self.tray_icon = None  # 托盘图标对象
+        self._tray_image = None  # 缓存的托盘图标图像
+        self._tray_thread = None  # 运行托盘图标的线程
         self.is_hidden = False  # 窗口是否隐藏到托盘
         
+        # 通知合并队列相关变量
+        self._pending_notifications = queue.SimpleQueue()  # 待显示的 (标题, 消息)，线程安全
+        self._flush_scheduled = False  # 是否已安排合并刷新
+        self._notification_lock = threading.Lock()  # 保护刷新标志
+        
+        # 退出信号，通知后台线程尽快结束
+        self._shutdown = threading.Event()
+        # 正在运行的后台线程池，退出程序时统一取消其中排队的任务
+        self._executors = set()
+        self._executors_lock = threading.Lock()
+        
+        # 正在后台执行的托盘操作，同一操作未完成时不重复启动
+        self._running_tray_actions = set()
+        self._tray_actions_lock = threading.Lock()
+        
+        # 界面日志缓冲相关变量
+        self._log_queue = deque()  # 待写入日志文本框的消息
+        self._log_flush_scheduled = False  # 是否已安排刷新日志
+        self._log_lock = threading.Lock()  # 工作线程与主线程共享缓冲时加锁
+        
         # 文件监控功能相关变量
         self.monitoring = False  # 监控功能开关状态
         self.observer = None  # 文件系统观察者对象
+        self.monitor_handler = None  # 文件系统事件处理器，停止监控时需要关闭其防抖线程
+        
+        # 用户主目录及由其派生的常用路径，只需计算一次
+        self._user_home = os.path.expanduser("~")
+        self._desktop = os.path.join(self._user_home, "Desktop")  # 桌面
+        self._downloads = os.path.join(self._user_home, "Downloads")  # 下载文件夹
+        self._documents = os.path.join(self._user_home, "Documents")  # 文档文件夹
+        # 托盘扫描功能使用的常用目录（桌面、下载、文档）
+        self._scan_paths = (self._desktop, self._downloads, self._documents)
+        # 常用目录是否存在的缓存：{路径: (是否存在, 检查时间)}
+        self._path_exists_cache = {}
+        # 根据窗口标题推测文件夹位置时尝试的父目录
+        self._path_prefixes = (
+            self._user_home,  # 用户主目录下的文件夹
+            self._desktop,  # 桌面上的文件夹
+            self._documents,  # 文档里的文件夹
+            self._downloads,  # 下载目录的文件夹
+            "C:\\",  # C盘根目录下的文件夹
+            "D:\\",  # D盘根目录下的文件夹
+        )
         
         # 初始化用户界面
         self.setup_ui()  # 创建和布局所有GUI组件
@@ -94,82 +256,123 @@ class FileOrganizerGUI:
         # 设置窗口关闭事件处理
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)  # 绑定窗口关闭事件
         
+        # 界面创建完成后等待核心组件初始化结束；初始化失败时直接抛出异常，
+        # 与原来一样在启动阶段失败，而不是打开一个每次操作都会出错的窗口
+        try:
+            self._backend_future.result()
+        except BaseException:
+            self.root.destroy()
+            raise
+        
+    def _init_backend(self):
+        """创建核心组件
+        
+        Returns:
+            tuple: (配置管理器, 日志记录器, 文件整理器)
+        """
+        config_manager = ConfigManager()  # 配置管理器，处理用户设置
+        logger = setup_logger()  # 日志记录器，记录操作日志
+        organizer = FileOrganizer(config_manager, logger)  # 文件整理器核心
+        return config_manager, logger, organizer
+        
+    @property
+    def config_manager(self):
+        """配置管理器，处理用户设置"""
+        return self._backend_future.result()[0]
+        
+    @property
+    def logger(self):
+        """日志记录器，记录操作日志"""
+        return self._backend_future.result()[1]
+        
+    @property
+    def organizer(self):
+        """文件整理器核心"""
+        return self._backend_future.result()[2]
+        
     def setup_modern_theme(self):
-        """设置现代化主题样式"""
+        """设置现代化主题样式
+        
+        以clam主题为基础创建自定义主题，所有样式通过一次theme_create调用注册
+        """
         # 设置窗口背景色为浅色
         self.root.configure(bg='#f8f9fa')
         
-        # 创建自定义样式
-        style = ttk.Style()
+        # 创建自定义样式，并保存以便后续复用
+        self.style = ttk.Style()
         
         # 配置现代化的颜色主题
-        style.theme_use('clam')  # 使用clam主题作为基础
-        
-        # 自定义按钮样式
-        style.configure('Modern.TButton',
-                       background='#007bff',
-                       foreground='white',
-                       borderwidth=0,
-                       focuscolor='none',
-                       padding=(12, 8))
-        style.map('Modern.TButton',
-                 background=[('active', '#0056b3'),
-                           ('pressed', '#004085')])
-        
-        # 自定义主要按钮样式
-        style.configure('Primary.TButton',
-                       background='#28a745',
-                       foreground='white',
-                       borderwidth=0,
-                       focuscolor='none',
-                       padding=(15, 10))
-        style.map('Primary.TButton',
-                 background=[('active', '#218838'),
-                           ('pressed', '#1e7e34')])
-        
-        # 自定义次要按钮样式
-        style.configure('Secondary.TButton',
-                       background='#6c757d',
-                       foreground='white',
-                       borderwidth=0,
-                       focuscolor='none',
-                       padding=(10, 6))
-        style.map('Secondary.TButton',
-                 background=[('active', '#5a6268'),
-                           ('pressed', '#545b62')])
-        
-        # 自定义输入框样式
-        style.configure('Modern.TEntry',
-                       fieldbackground='white',
-                       borderwidth=1,
-                       relief='solid',
-                       padding=(8, 6))
-        
-        # 自定义标签框样式
-        style.configure('Modern.TLabelframe',
-                       background='#f8f9fa',
-                       borderwidth=1,
-                       relief='solid')
-        style.configure('Modern.TLabelframe.Label',
-                       background='#f8f9fa',
-                       foreground='#495057',
-                       font=('Segoe UI', 10, 'bold'))
-        
-        # 自定义标签样式
-        style.configure('Title.TLabel',
-                       background='#f8f9fa',
-                       foreground='#212529',
-                       font=('Segoe UI', 18, 'bold'))
-        
-        style.configure('Subtitle.TLabel',
-                       background='#f8f9fa',
-                       foreground='#6c757d',
-                       font=('Segoe UI', 10))
-        
-        style.configure('Status.TLabel',
-                       background='#f8f9fa',
-                       foreground='#28a745',
-                       font=('Segoe UI', 9))
+        settings = {
+            # 自定义按钮样式
+            'Modern.TButton': {
+                'configure': {'background': '#007bff',
+                              'foreground': 'white',
+                              'borderwidth': 0,
+                              'focuscolor': 'none',
+                              'padding': (12, 8)},
+                'map': {'background': [('active', '#0056b3'),
+                                       ('pressed', '#004085')]},
+            },
+            # 自定义主要按钮样式
+            'Primary.TButton': {
+                'configure': {'background': '#28a745',
+                              'foreground': 'white',
+                              'borderwidth': 0,
+                              'focuscolor': 'none',
+                              'padding': (15, 10)},
+                'map': {'background': [('active', '#218838'),
+                                       ('pressed', '#1e7e34')]},
+            },
+            # 自定义次要按钮样式
+            'Secondary.TButton': {
+                'configure': {'background': '#6c757d',
+                              'foreground': 'white',
+                              'borderwidth': 0,
+                              'focuscolor': 'none',
+                              'padding': (10, 6)},
+                'map': {'background': [('active', '#5a6268'),
+                                       ('pressed', '#545b62')]},
+            },
+            # 自定义输入框样式
+            'Modern.TEntry': {
+                'configure': {'fieldbackground': 'white',
+                              'borderwidth': 1,
+                              'relief': 'solid',
+                              'padding': (8, 6)},
+            },
+            # 自定义标签框样式
+            'Modern.TLabelframe': {
+                'configure': {'background': '#f8f9fa',
+                              'borderwidth': 1,
+                              'relief': 'solid'},
+            },
+            'Modern.TLabelframe.Label': {
+                'configure': {'background': '#f8f9fa',
+                              'foreground': '#495057',
+                              'font': ('Segoe UI', 10, 'bold')},
+            },
+            # 自定义标签样式
+            'Title.TLabel': {
+                'configure': {'background': '#f8f9fa',
+                              'foreground': '#212529',
+                              'font': ('Segoe UI', 18, 'bold')},
+            },
+            'Subtitle.TLabel': {
+                'configure': {'background': '#f8f9fa',
+                              'foreground': '#6c757d',
+                              'font': ('Segoe UI', 10)},
+            },
+            'Status.TLabel': {
+                'configure': {'background': '#f8f9fa',
+                              'foreground': '#28a745',
+                              'font': ('Segoe UI', 9)},
+            },
+        }
+        
+        # 使用clam主题作为基础，一次性注册所有自定义样式
+        if MODERN_THEME_NAME not in self.style.theme_names():
+            self.style.theme_create(MODERN_THEME_NAME, parent='clam', settings=settings)
+        self.style.theme_use(MODERN_THEME_NAME)
         
     def setup_ui(self):
         """设置现代化用户界面
@@ -322,14 +525,22 @@ class FileOrganizerGUI:
         """浏览文件夹
         
         打开文件夹选择对话框，让用户选择要整理的文件夹
-        如果用户选择了文件夹，则更新界面上的文件夹路径显示
+        如果用户选择了文件夹，则更新界面上的文件夹路径显示，并记住该路径
         """
+        # 从上次选择的文件夹开始浏览，没有记录时从用户主目录开始
+        recent_dirs = self.config_manager.get_recent_paths("source_dirs")
+        initial_dir = recent_dirs[0] if recent_dirs else self._user_home
         # 打开文件夹选择对话框
-        folder = filedialog.askdirectory(title="选择要整理的文件夹")
+        folder = filedialog.askdirectory(title="选择要整理的文件夹",
+                                         mustexist=True, initialdir=initial_dir)
         # 如果用户选择了文件夹（没有取消）
         if folder:
             # 将选择的文件夹路径设置到界面变量中
             self.folder_var.set(folder)
+            # 记住本次选择的文件夹
+            if self.config_manager.get_setting('ui_settings.remember_paths', True):
+                self.config_manager.add_recent_path("source_dirs", folder)
+                self.config_manager.save_config()
             
     def organize_files(self):
         """整理文件
@@ -352,33 +563,31 @@ class FileOrganizerGUI:
             messagebox.showerror("错误", "文件夹不存在")
             return
             
-        # 在文件夹内创建分类子文件夹
-        target = os.path.join(folder, "分类文件")
-        os.makedirs(target, exist_ok=True)
-            
-        # 在后台线程中执行整理操作，避免阻塞UI界面
+        # 在后台线程中创建分类文件夹并执行整理操作，避免阻塞UI界面
         # daemon=True确保主程序退出时线程也会退出
         threading.Thread(target=self._organize_files_thread, 
-                        args=(folder, target), daemon=True).start()
+                        args=(folder,), daemon=True).start()
         
-    def _organize_files_thread(self, source, target):
+    def _organize_files_thread(self, source):
         """在后台线程中执行文件整理
         
         Args:
             source (str): 源文件夹路径
-            target (str): 目标分类文件夹路径
             
         该方法在独立线程中运行，避免阻塞主UI线程
-        执行实际的文件整理操作并更新界面状态和日志
+        在源文件夹内创建分类子文件夹，执行实际的文件整理操作并更新界面状态和日志
         """
         try:
+            # 在文件夹内的分类子文件夹中整理（由 organize_folder 负责创建）
+            target = os.path.join(source, "分类文件")
+            
             # 更新状态显示为正在整理
             self.status_var.set("正在整理文件...")
             # 记录开始整理的日志
             self.log_message(f"开始整理文件夹: {source}")
             
             # 调用文件整理器执行实际的整理操作
-            result = self.organizer.organize_folder(source, target)
+            result = self.organizer.organize_folder(source, target, stop_event=self._shutdown)
             
             # 记录整理结果日志
             self.log_message(f"整理完成! 处理了 {result['total']} 个文件")
@@ -400,9 +609,9 @@ class FileOrganizerGUI:
         这是一个便捷功能，用户无需手动选择桌面文件夹
         """
         # 获取当前用户的桌面路径
-        desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
+        desktop_path = self._desktop
         # 检查桌面路径是否存在
-        if os.path.exists(desktop_path):
+        if os.path.isdir(desktop_path):
             # 将桌面路径设置到文件夹选择框中
             self.folder_var.set(desktop_path)
             # 启动文件整理操作
@@ -439,9 +648,14 @@ class FileOrganizerGUI:
         # 记录日志
         self.log_message("定时提醒已开启 - 每2小时提醒一次")
         
-        # 安排第一次提醒（2小时后）
+        # 安排第一次提醒（2小时后），记录绝对目标时间以便校正计时误差
+        self._next_reminder_ts = time.monotonic() + self._reminder_interval()
         self.schedule_next_reminder()
         
+    def _reminder_interval(self):
+        """返回加入随机抖动后的提醒间隔（秒）"""
+        return REMINDER_INTERVAL * random.uniform(1 - REMINDER_JITTER, 1 + REMINDER_JITTER)
+        
     def stop_reminder(self):
         """停止定时提醒
         
@@ -465,13 +679,15 @@ class FileOrganizerGUI:
     def schedule_next_reminder(self):
         """安排下一次提醒
         
-        使用tkinter的after方法安排2小时后的提醒
+        使用tkinter的after方法在下一次提醒的目标时间触发
+        每次都根据单调时钟重新计算剩余时间，避免长时间运行产生累计误差
         只有在提醒功能启用时才会安排下一次提醒
         """
         # 检查提醒功能是否仍然启用
         if self.reminder_enabled:
-            # 安排2小时后的提醒（2小时 = 7200000毫秒）
-            self.reminder_timer = self.root.after(7200000, self.show_reminder)
+            # 计算距离目标时间的剩余毫秒数
+            delay_ms = max(1, int((self._next_reminder_ts - time.monotonic()) * 1000))
+            self.reminder_timer = self.root.after(delay_ms, self.show_reminder)
             
     def show_reminder(self):
         """显示整理提醒
@@ -481,6 +697,11 @@ class FileOrganizerGUI:
         """
         # 确认提醒功能仍然启用
         if self.reminder_enabled:
+            now = time.monotonic()
+            # 计时器提前触发时，按剩余时间重新安排
+            if now < self._next_reminder_ts - 1:
+                self.schedule_next_reminder()
+                return
             # 显示提醒通知
             self.show_notification(
                 "文件整理提醒", 
@@ -488,7 +709,10 @@ class FileOrganizerGUI:
             )
             # 记录提醒日志
             self.log_message("显示定时整理提醒")
-            # 安排下一次提醒
+            # 以上一次的目标时间为基准安排下一次提醒，如已错过（如系统休眠）则从现在开始计时
+            self._next_reminder_ts += self._reminder_interval()
+            if self._next_reminder_ts <= now:
+                self._next_reminder_ts = now + self._reminder_interval()
             self.schedule_next_reminder()
         
     def open_config(self):
@@ -531,16 +755,34 @@ class FileOrganizerGUI:
             message (str): 要显示的日志消息
             
         在GUI界面的日志文本框中显示带时间戳的消息
-        确保在主线程中更新UI组件
+        消息会先缓冲，再批量在主线程中更新UI组件
         """
         # 生成当前时间戳
         timestamp = datetime.now().strftime("%H:%M:%S")
         # 格式化日志条目，包含时间戳和消息
         log_entry = f"[{timestamp}] {message}\n"
         
+        # 先放入缓冲队列，由主线程每 LOG_FLUSH_INTERVAL_MS 毫秒统一写入一次
+        # 避免大量整理文件时每条消息都单独触发一次界面刷新
+        with self._log_lock:
+            self._log_queue.append(log_entry)
+            if self._log_flush_scheduled:
+                return
+            self._log_flush_scheduled = True
         # 使用tkinter的after方法确保在主线程中更新UI
-        # after(0, ...)会在下一个空闲时刻执行，保证线程安全
-        self.root.after(0, self._update_log_text, log_entry)
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._flush_log)
+        
+    def _flush_log(self):
+        """将缓冲队列中的日志消息一次性写入日志文本框
+        
+        此方法必须在主线程中调用
+        """
+        with self._log_lock:
+            text = "".join(self._log_queue)
+            self._log_queue.clear()
+            self._log_flush_scheduled = False
+        if text:
+            self._update_log_text(text)
         
     def stop_monitoring(self):
         """停止文件监控
@@ -553,10 +795,14 @@ class FileOrganizerGUI:
             if hasattr(self, 'observer') and self.observer:
                 # 停止监控器
                 self.observer.stop()
-                # 等待监控器线程结束
-                self.observer.join()
+                # 等待监控器线程结束，最多等待2秒
+                self.observer.join(timeout=2)
                 # 清空监控器引用
                 self.observer = None
+            # 关闭事件处理器的防抖线程，并在当前线程中输出尚未显示的新文件
+            if self.monitor_handler:
+                self.monitor_handler.close()
+                self.monitor_handler = None
             # 设置监控状态为False
             self.monitoring = False
             # 记录停止监控的日志
@@ -581,6 +827,7 @@ class FileOrganizerGUI:
                 
             # 导入watchdog相关模块
             from watchdog.observers import Observer
+            from watchdog.observers.polling import PollingObserver
             from watchdog.events import FileSystemEventHandler
             
             # 定义文件事件处理器类
@@ -596,6 +843,16 @@ class FileOrganizerGUI:
                         gui: GUI实例的引用，用于更新界面
                     """
                     self.gui = gui
+                    # 短时间内连续创建的文件先缓冲，合并成一条日志
+                    self._pending = []
+                    self._first_event_ts = 0.0
+                    # 缓冲的文件应当输出的时间点，每个新事件都会向后推迟
+                    self._deadline = 0.0
+                    self._closed = False
+                    self._cond = threading.Condition()
+                    # 整个监控期间只使用这一个防抖线程，而不是每个事件创建一个定时器线程
+                    self._thread = threading.Thread(target=self._debounce_loop, daemon=True)
+                    self._thread.start()
                     
                 def on_created(self, event):
                     """文件创建事件处理
@@ -603,17 +860,84 @@ class FileOrganizerGUI:
                     Args:
                         event: 文件系统事件对象
                     """
+                    # 程序正在退出时不再处理新事件
+                    if self.gui._shutdown.is_set():
+                        return
                     # 只处理文件创建事件，忽略文件夹创建
-                    if not event.is_directory:
-                        # 在GUI日志中显示新文件信息
-                        self.gui.log_message(f"检测到新文件: {os.path.basename(event.src_path)}")
+                    if event.is_directory:
+                        return
+                    with self._cond:
+                        now = time.monotonic()
+                        if not self._pending:
+                            self._first_event_ts = now
+                        self._pending.append(os.path.basename(event.src_path))
+                        
+                        # 尾沿防抖：每个新事件都把输出时间推迟到 MONITOR_DEBOUNCE 秒之后；
+                        # 但从第一个事件算起最多等待 MONITOR_MAX_LATENCY 秒
+                        self._deadline = min(now + MONITOR_DEBOUNCE,
+                                             self._first_event_ts + MONITOR_MAX_LATENCY)
+                        self._cond.notify()
+                        
+                def close(self):
+                    """停止防抖线程，并在调用线程中输出缓冲中剩余的新文件
+                    
+                    通常在Tk主线程中调用，因此不等待防抖线程结束：
+                    防抖线程输出日志时需要主线程响应，在主线程中等待它只会让界面卡住
+                    """
+                    with self._cond:
+                        self._closed = True
+                        names = self._pending
+                        self._pending = []
+                        self._cond.notify()
+                    self._flush(names)
+                    
+                def _debounce_loop(self):
+                    """防抖线程：等到输出时间点后，把缓冲的新文件合并成一条日志"""
+                    while True:
+                        with self._cond:
+                            while not self._closed:
+                                if not self._pending:
+                                    self._cond.wait()
+                                    continue
+                                remaining = self._deadline - time.monotonic()
+                                if remaining <= 0:
+                                    break
+                                # 等待期间有新事件时会被唤醒并重新计算剩余时间
+                                self._cond.wait(remaining)
+                            if self._closed:
+                                # 剩余的新文件由 close() 在调用线程中输出
+                                return
+                            names = self._pending
+                            self._pending = []
+                        self._flush(names)
+                        
+                def _flush(self, names):
+                    """在GUI日志中显示缓冲的新文件信息
+                    
+                    Args:
+                        names (list): 新文件的文件名列表
+                    """
+                    if self.gui._shutdown.is_set():
+                        return
+                    if len(names) == 1:
+                        self.gui.log_message(f"检测到新文件: {names[0]}")
+                    elif names:
+                        more = "..." if len(names) > 3 else ""
+                        self.gui.log_message(f"检测到 {len(names)} 个新文件: {', '.join(names[:3])}{more}")
                         
             # 创建文件监控器实例
-            self.observer = Observer()
+            # 网络驱动器上的系统文件通知不可靠（可能丢失事件），改用轮询方式监控
+            if (self.config_manager.get_setting('monitor_settings.use_polling_observer', False)
+                    or self._is_remote_drive(folder_path)):
+                interval = self.config_manager.get_setting('monitor_settings.polling_interval', 5)
+                self.observer = PollingObserver(timeout=interval)
+                self.logger.info(f"使用轮询方式监控文件夹，间隔 {interval} 秒")
+            else:
+                self.observer = Observer()
             # 创建事件处理器实例
-            handler = FileHandler(self)
+            self.monitor_handler = FileHandler(self)
             # 为指定路径安排监控，recursive=False表示不递归监控子文件夹
-            self.observer.schedule(handler, folder_path, recursive=False)
+            self.observer.schedule(self.monitor_handler, folder_path, recursive=False)
             # 启动监控器
             self.observer.start()
             # 设置监控状态为True
@@ -625,7 +949,29 @@ class FileOrganizerGUI:
             # 如果启动监控时发生异常，记录错误并设置状态为False
             self.logger.error(f"启动监控时出错: {e}")
             self.monitoring = False
+            if self.monitor_handler:
+                self.monitor_handler.close()
+                self.monitor_handler = None
         
+    def _is_remote_drive(self, path):
+        """判断路径是否位于网络驱动器上 (Windows特定)
+        
+        Args:
+            path (str): 要检查的路径
+            
+        Returns:
+            bool: 如果是网络驱动器返回True，否则（包括无法判断时）返回False
+        """
+        try:
+            import win32file
+            drive = os.path.splitdrive(os.path.abspath(path))[0]
+            if not drive:
+                return False
+            return win32file.GetDriveType(drive + "\\") == win32file.DRIVE_REMOTE
+        except Exception as e:
+            self.logger.debug(f"检测驱动器类型失败: {e}")
+            return False
+            
     def _update_log_text(self, message):
         """更新日志文本框
         
@@ -633,20 +979,120 @@ class FileOrganizerGUI:
             message (str): 要添加到日志文本框的消息
             
         在GUI的日志文本框中插入新消息并自动滚动到底部
+        文本框最多保留 MAX_LOG_LINES 行，超出后一次删除到只剩约
+        MAX_LOG_LINES - LOG_TRIM_LINES 行
         此方法必须在主线程中调用
         """
         # 在文本框末尾插入新消息
         self.log_text.insert(tk.END, message)
+        # 限制文本框的总行数，避免长时间监控时内容无限增长
+        lines = int(self.log_text.index('end-1c').split('.')[0])
+        if lines > MAX_LOG_LINES:
+            self.log_text.delete('1.0', f'{lines - MAX_LOG_LINES + LOG_TRIM_LINES}.0')
         # 自动滚动到文本框底部，显示最新消息
         self.log_text.see(tk.END)
         
     def create_tray_icon(self):
         """创建托盘图标
         
-        使用PIL库创建一个简单的图标图像
-        绘制文件夹样式的图标，包含"整理"文字
-        如果创建失败，使用简单的蓝色方块作为备用图标
+        使用缓存的图标图像和托盘菜单创建托盘图标实例
+        图标图像只在第一次调用时绘制
+        """
+        # 按需导入托盘库
+        import pystray  # 系统托盘图标支持
+        
+        # 图标图像是静态的，只在第一次创建时绘制，之后复用缓存
+        if self._tray_image is None:
+            self._tray_image = self._render_tray_image()
+        image = self._tray_image
+        
+        # 创建托盘菜单，定义托盘图标的右键菜单项
+        # 整理、统计和扫描等耗时操作在后台线程中执行，避免阻塞托盘菜单
+        menu = pystray.Menu(
+            # "快速整理" 子菜单
+            pystray.MenuItem("快速整理", pystray.Menu(
+                pystray.MenuItem("整理桌面", self._run_async(self.tray_organize_desktop)),
+                pystray.MenuItem("整理下载文件夹", self._run_async(self.tray_organize_downloads)),
+                pystray.MenuItem("整理文档文件夹", self._run_async(self.tray_organize_documents))
+            )),
+            # "文件统计" 子菜单
+            pystray.MenuItem("文件统计", pystray.Menu(
+                pystray.MenuItem("桌面文件统计", self._run_async(self.tray_stats_desktop)),
+                pystray.MenuItem("下载文件夹统计", self._run_async(self.tray_stats_downloads)),
+                pystray.MenuItem("系统垃圾文件扫描", self._run_async(self.tray_scan_junk)),
+                pystray.MenuItem("全面扫描", self._run_async(self.tray_scan_all))
+            )),
+            # "实用工具" 子菜单
+            pystray.MenuItem("实用工具", pystray.Menu(
+                pystray.MenuItem("清理回收站", self.tray_empty_recycle),
+                pystray.MenuItem("清理临时文件", self._run_async(self.tray_clean_temp)),
+                pystray.MenuItem("查找重复文件", self._run_async(self.tray_find_duplicates))
+            )),
+            # 分隔线
+            pystray.Menu.SEPARATOR,
+            # "显示主窗口" 菜单项
+            pystray.MenuItem("显示主窗口", self.show_window),
+            # "退出" 菜单项
+            pystray.MenuItem("退出", self.quit_app)
+        )
+        
+        # 创建托盘图标实例
+        self.tray_icon = pystray.Icon("文件整理工具", image, menu=menu)
+        
+    def _run_async(self, handler):
+        """包装托盘菜单回调，使其在后台守护线程中执行
+        
+        同一操作仍在执行时再次点击会被忽略并给出提示，避免重复扫描同一批目录
+        
+        Args:
+            handler (callable): 原托盘菜单处理函数
+            
+        Returns:
+            callable: 供pystray调用的菜单回调
         """
+        name = handler.__name__
+        
+        def run(icon, item):
+            try:
+                handler(icon, item)
+            finally:
+                with self._tray_actions_lock:
+                    self._running_tray_actions.discard(name)
+                    
+        def callback(icon, item):
+            with self._tray_actions_lock:
+                if name in self._running_tray_actions:
+                    already_running = True
+                else:
+                    already_running = False
+                    self._running_tray_actions.add(name)
+            if already_running:
+                self.show_notification("提示", "该操作正在进行中，请稍候")
+                return
+            threading.Thread(target=run, args=(icon, item), daemon=True).start()
+        return callback
+        
+    def _render_tray_image(self):
+        """绘制托盘图标图像
+        
+        优先读取上次绘制后保存的图标文件；没有缓存时使用PIL库绘制文件夹样式的图标，
+        包含"整理"文字，并保存到 TRAY_ICON_CACHE。如果创建失败，使用简单的蓝色方块作为备用图标
+        
+        Returns:
+            PIL.Image.Image: 绘制好的图标图像
+        """
+        # 按需导入图像处理库
+        from PIL import Image, ImageDraw  # 图像处理库
+        
+        # 读取磁盘缓存的图标
+        try:
+            with Image.open(TRAY_ICON_CACHE) as cached:
+                cached.load()
+                return cached.copy()
+        except (OSError, ValueError):
+            # 没有缓存或缓存已损坏时重新绘制
+            pass
+            
         # 尝试创建自定义图标
         try:
             # 创建64x64像素的RGBA图像，背景为蓝色
@@ -673,74 +1119,47 @@ class FileOrganizerGUI:
             # 记录成功创建图标的日志
             self.logger.info("成功创建托盘图标")
             
+            # 保存到磁盘缓存，保存失败不影响使用
+            try:
+                image.save(TRAY_ICON_CACHE, 'PNG')
+            except OSError as e:
+                self.logger.debug(f"保存托盘图标缓存失败: {e}")
+            
         except Exception as e:
             # 如果创建图标失败，记录错误并使用备用图标
             self.logger.error(f"创建图标失败: {e}")
             # 创建最简单的备用图标（蓝色方块）
             image = Image.new('RGB', (32, 32), color='blue')
-        
-        # 创建托盘菜单，定义托盘图标的右键菜单项
-        menu = pystray.Menu(
-            # "快速整理" 子菜单
-            pystray.MenuItem("快速整理", pystray.Menu(
-                pystray.MenuItem("整理桌面", self.tray_organize_desktop),
-                pystray.MenuItem("整理下载文件夹", self.tray_organize_downloads),
-                pystray.MenuItem("整理文档文件夹", self.tray_organize_documents)
-            )),
-            # "文件统计" 子菜单
-            pystray.MenuItem("文件统计", pystray.Menu(
-                pystray.MenuItem("桌面文件统计", self.tray_stats_desktop),
-                pystray.MenuItem("下载文件夹统计", self.tray_stats_downloads),
-                pystray.MenuItem("系统垃圾文件扫描", self.tray_scan_junk)
-            )),
-            # "实用工具" 子菜单
-            pystray.MenuItem("实用工具", pystray.Menu(
-                pystray.MenuItem("清理回收站", self.tray_empty_recycle),
-                pystray.MenuItem("清理临时文件", self.tray_clean_temp),
-                pystray.MenuItem("查找重复文件", self.tray_find_duplicates)
-            )),
-            # 分隔线
-            pystray.Menu.SEPARATOR,
-            # "显示主窗口" 菜单项
-            pystray.MenuItem("显示主窗口", self.show_window),
-            # "退出" 菜单项
-            pystray.MenuItem("退出", self.quit_app)
-        )
-        
-        # 创建托盘图标实例
-        self.tray_icon = pystray.Icon("文件整理工具", image, menu=menu)
+            
+        return image
         
     def hide_to_tray(self):
         """隐藏到系统托盘
         
         隐藏主窗口，并在系统托盘显示图标
-        确保先停止现有托盘图标，然后重新创建以避免冲突
+        托盘图标和托盘线程只创建一次，之后的隐藏/显示只切换图标的可见状态
         """
-        # 先停止现有的托盘图标（如果存在）
-        if self.tray_icon:
-            try:
-                self.tray_icon.stop()
-            except:
-                pass  # 忽略停止时可能出现的错误
-            self.tray_icon = None
-            
-        # 重新创建托盘图标
-        self.create_tray_icon()
+        if self.tray_icon and self._tray_thread and self._tray_thread.is_alive():
+            # 托盘线程仍在运行，直接重新显示图标
+            self.tray_icon.visible = True
+        else:
+            # 第一次隐藏（或托盘线程已结束）时创建托盘图标
+            self.create_tray_icon()
+            # 在独立线程中运行托盘图标，避免阻塞主UI线程
+            self._tray_thread = threading.Thread(target=self.tray_icon.run, daemon=True)
+            self._tray_thread.start()
             
         # 隐藏主窗口
         self.root.withdraw()
         # 更新隐藏状态
         self.is_hidden = True
         
-        # 在新线程中运行托盘图标，避免阻塞主UI线程
-        threading.Thread(target=self.tray_icon.run, daemon=True).start()
-        
     def show_window(self, icon=None, item=None):
         """显示主窗口
         
         从系统托盘恢复并显示主窗口
         将窗口置于顶层，确保用户可以看到
-        同时停止托盘图标以避免重复创建
+        同时隐藏托盘图标，托盘线程保持运行以便下次复用
         """
         # 显示主窗口
         self.root.deiconify()
@@ -749,20 +1168,37 @@ class FileOrganizerGUI:
         # 更新隐藏状态
         self.is_hidden = False
         
-        # 停止当前的托盘图标，避免重复创建导致的问题
+        # 隐藏当前的托盘图标
         if self.tray_icon:
             try:
-                self.tray_icon.stop()
-            except:
-                pass  # 忽略停止时可能出现的错误
-            self.tray_icon = None
+                self.tray_icon.visible = False
+            except (RuntimeError, AttributeError) as e:
+                # 托盘图标可能已经停止，记录后忽略
+                self.logger.debug(f"隐藏托盘图标失败: {e}")
+        
+    def _stop_tray(self):
+        """停止托盘图标
         
+        可以重复调用：托盘图标停止后引用即被清空，之后的调用直接返回
+        托盘后端已经停止或未能启动时，停止操作可能抛出异常，记录后忽略
+        """
+        icon, self.tray_icon = self.tray_icon, None
+        if icon is None:
+            return
+        try:
+            icon.stop()
+        except (RuntimeError, AttributeError) as e:
+            self.logger.debug(f"停止托盘图标失败: {e}")
+            
     def on_closing(self):
         """窗口关闭事件处理
         
         当用户点击窗口关闭按钮时调用此方法
         负责安全地清理所有后台任务和资源，然后关闭窗口
         """
+        # 通知后台线程尽快结束，并取消线程池中尚未开始的任务
+        self._shutdown.set()
+        self._cancel_pools()
         try:
             # 检查并停止文件监控
             if hasattr(self, 'monitoring') and self.monitoring:
@@ -770,37 +1206,79 @@ class FileOrganizerGUI:
             # 检查并停止定时提醒
             if hasattr(self, 'reminder_enabled') and self.reminder_enabled:
                 self.stop_reminder()
-            # 检查并停止托盘图标
-            if hasattr(self, 'tray_icon') and self.tray_icon:
-                self.tray_icon.stop()
         except Exception as e:
             # 记录关闭过程中发生的任何错误
             self.logger.error(f"关闭程序时出错: {e}")
         finally:
-            # 确保窗口最终被销毁
-            self.root.destroy()
+            # 停止托盘图标，并确保窗口最终被销毁
+            try:
+                self._stop_tray()
+            finally:
+                self.root.destroy()
         
     def quit_app(self, icon=None, item=None):
         """退出应用程序
         
         从托盘菜单或程序内部调用，完全退出应用程序
-        清理所有资源并强制结束进程，确保完全退出
+        通知后台线程停止，清理所有资源后正常结束主循环
         """
         # 记录退出日志
         self.logger.info("正在退出应用程序...")
-        # 停止定时提醒
-        if self.reminder_enabled:
-            self.stop_reminder()
+        # 通知后台线程尽快结束，并取消线程池中尚未开始的任务
+        self._shutdown.set()
+        self._cancel_pools()
         # 停止托盘图标
-        if self.tray_icon:
-            self.tray_icon.stop()
-        # 退出tkinter主循环
-        self.root.quit()
-        # 销毁主窗口
-        self.root.destroy()
-        # 强制结束进程，确保所有线程都已终止
-        import os
-        os._exit(0)
+        self._stop_tray()
+        # 托盘菜单回调运行在托盘线程中，界面相关的清理交给主线程执行
+        self.root.after(0, self._shutdown_app)
+        
+    @contextmanager
+    def _cancellable_pool(self, max_workers):
+        """创建一个退出程序时可以取消的线程池
+        
+        线程池在使用期间登记在 self._executors 中，_cancel_pools 会取消其中排队的任务；
+        线程池中的线程在解释器退出时会被等待，因此工作函数也需要自行检查 self._shutdown
+        
+        Args:
+            max_workers (int): 最大工作线程数
+            
+        Yields:
+            ThreadPoolExecutor: 线程池
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        with self._executors_lock:
+            self._executors.add(executor)
+        try:
+            yield executor
+        finally:
+            with self._executors_lock:
+                self._executors.discard(executor)
+            # 正在退出时不等待剩余任务
+            executor.shutdown(wait=not self._shutdown.is_set(), cancel_futures=True)
+            
+    def _cancel_pools(self):
+        """取消所有后台线程池中尚未开始的任务，不等待正在执行的任务"""
+        with self._executors_lock:
+            executors = list(self._executors)
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+    def _shutdown_app(self):
+        """在主线程中停止后台服务并关闭主窗口"""
+        try:
+            # 停止定时提醒
+            if self.reminder_enabled:
+                self.stop_reminder()
+            # 停止文件监控
+            if self.monitoring:
+                self.stop_monitoring()
+        except Exception as e:
+            self.logger.error(f"退出程序时出错: {e}")
+        finally:
+            # 退出tkinter主循环
+            self.root.quit()
+            # 销毁主窗口
+            self.root.destroy()
         
     def get_active_folder(self):
         """获取当前活动窗口的文件夹路径 (Windows特定)
@@ -813,53 +1291,72 @@ class FileOrganizerGUI:
             str or None: 如果成功获取到文件夹路径，则返回路径字符串，否则返回None
         """
         try:
+            # 按需导入Windows系统API
+            import win32gui  # Windows GUI API
+            import win32process  # Windows进程API
+            import psutil  # 系统和进程工具
+            
+            # 获取当前前台窗口的句柄，两种方法共用
+            active_hwnd = win32gui.GetForegroundWindow()
+            self.logger.info(f"当前活动窗口句柄: {active_hwnd}")
+            if not active_hwnd:
+                # 没有前台窗口时无需继续检测
+                self.logger.warning("没有活动窗口，无法获取活动文件夹")
+                return None
+                
             # --- 方法1: 通过COM接口 (Shell.Application) --- #
             try:
-                # 导入win32com模块
-                import win32com.client
-                # 创建Shell.Application COM对象
-                shell = win32com.client.Dispatch("Shell.Application")
-                # 获取所有打开的窗口
-                windows = shell.Windows()
-                
-                # 获取当前前台窗口的句柄
-                active_hwnd = win32gui.GetForegroundWindow()
-                self.logger.info(f"当前活动窗口句柄: {active_hwnd}")
-                
-                # 遍历所有窗口，查找与活动窗口句柄匹配的资源管理器窗口
-                for window in windows:
-                    try:
-                        # 检查窗口句柄是否匹配
-                        if hasattr(window, 'HWND') and window.HWND == active_hwnd:
+                # 只有资源管理器窗口才需要枚举Shell窗口，其他窗口直接跳过耗时的COM调用
+                window_class = win32gui.GetClassName(active_hwnd)
+                if window_class in EXPLORER_WINDOW_CLASSES:
+                    # 导入win32com模块
+                    import win32com.client
+                    # 创建Shell.Application COM对象
+                    shell = win32com.client.Dispatch("Shell.Application")
+                    # 获取所有打开的窗口
+                    windows = shell.Windows()
+                    
+                    # 遍历所有窗口，查找与活动窗口句柄匹配的资源管理器窗口
+                    for window in windows:
+                        try:
+                            # 检查窗口句柄是否匹配（每次属性访问都是一次COM调用，只读取一次）
+                            hwnd = window.HWND
+                        except Exception as e:
+                            # 忽略无法读取句柄的窗口
+                            self.logger.debug(f"检查窗口时出错: {e}")
+                            continue
+                        if hwnd != active_hwnd:
+                            continue
+                            
+                        try:
                             # 获取窗口的URL格式位置
                             location = window.LocationURL
                             if location:
                                 self.logger.info(f"找到活动窗口位置: {location}")
                                 # 将 'file:///' 格式的URL转换为本地路径
-                                if location.startswith('file:///'):
-                                    import urllib.parse
+                                if location.startswith(FILE_URI_PREFIX):
                                     # 解码URL并移除 'file:///' 前缀
-                                    path = urllib.parse.unquote(location[8:])
+                                    path = unquote(location[len(FILE_URI_PREFIX):])
                                     # 将路径分隔符转换为Windows格式
                                     path = path.replace('/', '\\')
                                     # 验证路径是否存在且为文件夹
-                                    if os.path.exists(path) and os.path.isdir(path):
+                                    if os.path.isdir(path):
                                         self.logger.info(f"通过Shell Application检测到活动文件夹: {path}")
                                         return path
-                    except Exception as e:
-                        # 忽略检查单个窗口时可能出现的错误
-                        self.logger.debug(f"检查窗口时出错: {e}")
-                        continue
+                        except Exception as e:
+                            self.logger.debug(f"读取活动窗口位置时出错: {e}")
+                        # 活动窗口只有一个，找到后无需继续遍历
+                        break
+                else:
+                    self.logger.debug(f"活动窗口不是资源管理器窗口 ({window_class})，跳过Shell Application方法")
             except Exception as e:
                 # 如果COM方法整体失败，记录错误并继续尝试下一种方法
                 self.logger.debug(f"Shell Application方法失败: {e}")
             
             # --- 方法2: 通过窗口标题和进程信息 --- #
             try:
-                # 获取当前前台窗口句柄
-                hwnd = win32gui.GetForegroundWindow()
                 # 获取窗口所属进程ID
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                _, pid = win32process.GetWindowThreadProcessId(active_hwnd)
                 # 获取进程对象
                 process = psutil.Process(pid)
                 # 获取进程名称
@@ -870,7 +1367,7 @@ class FileOrganizerGUI:
                 # 检查进程是否为资源管理器
                 if 'explorer.exe' in process_name:
                     # 获取窗口标题
-                    window_title = win32gui.GetWindowText(hwnd)
+                    window_title = win32gui.GetWindowText(active_hwnd)
                     self.logger.info(f"资源管理器窗口标题: '{window_title}'")
                     
                     # 尝试从窗口标题中解析路径
@@ -885,27 +1382,31 @@ class FileOrganizerGUI:
                         self.logger.info(f"解析出的文件夹名: '{folder_name}'")
                         
                         # 尝试一些常见的路径组合来验证解析出的文件夹名
-                        user_home = os.path.expanduser("~")
-                        possible_paths = [
-                            folder_name,  # 假设是完整路径
-                            os.path.join(user_home, folder_name),  # 用户主目录下的文件夹
-                            os.path.join(user_home, "Desktop", folder_name),  # 桌面上的文件夹
-                            os.path.join(user_home, "Documents", folder_name),  # 文档里的文件夹
-                            os.path.join(user_home, "Downloads", folder_name),  # 下载目录的文件夹
-                            os.path.join("C:\\", folder_name),  # C盘根目录下的文件夹
-                            os.path.join("D:\\", folder_name),  # D盘根目录下的文件夹
-                        ]
+                        if (not folder_name
+                                or any(c in folder_name for c in INVALID_FOLDER_NAME_CHARS)
+                                or ':' in folder_name[2:]
+                                or folder_name.endswith("资源管理器")):
+                            # 标题中包含文件名非法字符或不是文件夹名，跳过路径探测
+                            possible_paths = []
+                        elif len(folder_name) > 2 and folder_name[1] == ':':
+                            # 标题本身就是完整路径，只需检查它自己
+                            possible_paths = [folder_name]
+                        else:
+                            # 先假设是完整路径，再依次尝试常见的父目录
+                            possible_paths = [folder_name]
+                            possible_paths.extend(os.path.join(prefix, folder_name)
+                                                  for prefix in self._path_prefixes)
                         
                         # 遍历可能的路径，找到存在的那个
                         for path in possible_paths:
-                            if os.path.exists(path) and os.path.isdir(path):
+                            if os.path.isdir(path):
                                 self.logger.info(f"通过标题解析找到路径: {path}")
                                 return path
                     
                     # 如果标题解析失败，尝试获取资源管理器进程的当前工作目录作为备选
                     try:
                         cwd = process.cwd()
-                        if os.path.exists(cwd) and os.path.isdir(cwd):
+                        if os.path.isdir(cwd):
                             self.logger.info(f"使用进程工作目录: {cwd}")
                             return cwd
                     except Exception as e:
@@ -922,6 +1423,27 @@ class FileOrganizerGUI:
             self.logger.error(f"获取活动文件夹时发生严重错误: {e}")
             return None
             
+    def _path_exists_cached(self, path, ttl=PATH_EXISTS_TTL):
+        """检查目录是否存在，结果缓存一段时间
+        
+        桌面、下载等常用目录在一次会话中几乎不会消失，
+        缓存检查结果可以避免每次托盘操作都重复访问文件系统
+        
+        Args:
+            path (str): 要检查的目录
+            ttl (float): 缓存有效期（秒）
+            
+        Returns:
+            bool: 目录存在返回True，否则返回False
+        """
+        now = time.monotonic()
+        cached = self._path_exists_cache.get(path)
+        if cached is not None and now - cached[1] < ttl:
+            return cached[0]
+        exists = os.path.isdir(path)
+        self._path_exists_cache[path] = (exists, now)
+        return exists
+        
     # --- 托盘菜单功能 --- #
     
     def tray_organize_desktop(self, icon=None, item=None):
@@ -930,7 +1452,7 @@ class FileOrganizerGUI:
         调用一个通用方法来整理桌面文件夹，并显示通知
         """
         self._organize_folder_with_notification(
-            os.path.join(os.path.expanduser("~"), "Desktop"),
+            self._desktop,
             "桌面"
         )
         
@@ -940,7 +1462,7 @@ class FileOrganizerGUI:
         调用一个通用方法来整理下载文件夹，并显示通知
         """
         self._organize_folder_with_notification(
-            os.path.join(os.path.expanduser("~"), "Downloads"),
+            self._downloads,
             "下载文件夹"
         )
         
@@ -950,7 +1472,7 @@ class FileOrganizerGUI:
         调用一个通用方法来整理文档文件夹，并显示通知
         """
         self._organize_folder_with_notification(
-            os.path.join(os.path.expanduser("~"), "Documents"),
+            self._documents,
             "文档文件夹"
         )
         
@@ -963,16 +1485,15 @@ class FileOrganizerGUI:
         """
         try:
             # 检查文件夹是否存在
-            if not os.path.exists(folder_path):
+            if not self._path_exists_cached(folder_path):
                 self.show_notification("错误", f"{folder_name}不存在")
                 return
                 
-            # 确定目标文件夹路径
+            # 确定目标文件夹路径（由 organize_folder 负责创建）
             target = os.path.join(folder_path, "分类文件")
-            os.makedirs(target, exist_ok=True)
             
             # 调用核心整理逻辑
-            moved_files = self.organizer.organize_folder(folder_path, target)
+            moved_files = self.organizer.organize_folder(folder_path, target, stop_event=self._shutdown)
             
             # 根据整理结果显示不同的通知
             if moved_files:
@@ -994,7 +1515,7 @@ class FileOrganizerGUI:
         调用通用统计方法来分析桌面文件夹
         """
         self._show_folder_stats(
-            os.path.join(os.path.expanduser("~"), "Desktop"),
+            self._desktop,
             "桌面"
         )
         
@@ -1004,7 +1525,7 @@ class FileOrganizerGUI:
         调用通用统计方法来分析下载文件夹
         """
         self._show_folder_stats(
-            os.path.join(os.path.expanduser("~"), "Downloads"),
+            self._downloads,
             "下载文件夹"
         )
         
@@ -1017,7 +1538,7 @@ class FileOrganizerGUI:
         """
         try:
             # 检查文件夹是否存在
-            if not os.path.exists(folder_path):
+            if not self._path_exists_cached(folder_path):
                 self.show_notification("错误", f"{folder_name}不存在")
                 return
                 
@@ -1025,28 +1546,30 @@ class FileOrganizerGUI:
             file_count = 0
             folder_count = 0
             total_size = 0
-            file_types = {}
-            
-            # 遍历文件夹内容
-            for item in os.listdir(folder_path):
-                item_path = os.path.join(folder_path, item)
-                if os.path.isfile(item_path):
-                    file_count += 1
-                    size = os.path.getsize(item_path)
-                    total_size += size
-                    
-                    # 按扩展名统计文件类型
-                    ext = os.path.splitext(item)[1].lower()
-                    if ext:
-                        file_types[ext] = file_types.get(ext, 0) + 1
-                elif os.path.isdir(item_path):
-                    folder_count += 1
+            file_types = Counter()
+            
+            # 遍历文件夹内容，使用scandir复用目录项中已有的文件信息
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        file_count += 1
+                        size = entry.stat().st_size
+                        total_size += size
+                        
+                        # 按扩展名统计文件类型（直接查找最后一个点，省去splitext的开销；
+                        # 与splitext一致，以点开头的文件名不视为扩展名）
+                        name = entry.name
+                        dot_idx = name.rfind('.')
+                        if 0 < dot_idx < len(name) - 1:
+                            file_types[name[dot_idx:].lower()] += 1
+                    elif entry.is_dir():
+                        folder_count += 1
                     
             # 将总大小转换为MB
             size_mb = total_size / (1024 * 1024)
             
             # 找出最常见的三种文件类型
-            top_types = sorted(file_types.items(), key=lambda x: x[1], reverse=True)[:3]
+            top_types = file_types.most_common(3)
             types_str = ", ".join([f"{ext}({count})" for ext, count in top_types])
             
             # 构建通知消息
@@ -1066,32 +1589,17 @@ class FileOrganizerGUI:
         在用户常用目录中扫描并报告潜在的垃圾文件
         """
         try:
-            # 定义常见的垃圾文件模式
-            junk_patterns = [
-                "*.tmp", "*.temp", "*.log", "*.bak", "*.old",
-                "Thumbs.db", "desktop.ini", ".DS_Store"  # 包含macOS的垃圾文件
-            ]
-            
-            # 初始化找到的垃圾文件列表
-            junk_files = []
             # 定义要扫描的常用路径
-            scan_paths = [
-                os.path.join(os.path.expanduser("~"), "Desktop"),
-                os.path.join(os.path.expanduser("~"), "Downloads"),
-                os.path.join(os.path.expanduser("~"), "Documents")
-            ]
+            scan_paths = self._scan_paths
             
-            # 遍历路径和模式进行扫描
-            for scan_path in scan_paths:
-                if os.path.exists(scan_path):
-                    for pattern in junk_patterns:
-                        import glob
-                        matches = glob.glob(os.path.join(scan_path, pattern))
-                        junk_files.extend(matches)
+            # 每个路径只遍历一次，收集找到的垃圾文件，元素为 (路径, 大小)
+            junk_files = list(chain.from_iterable(
+                iter_junk_files(scan_path) for scan_path in scan_paths
+                if self._path_exists_cached(scan_path)))
                         
             # 根据扫描结果构建通知消息
             if junk_files:
-                total_size = sum(os.path.getsize(f) for f in junk_files if os.path.exists(f))
+                total_size = sum(size for _, size in junk_files)
                 size_mb = total_size / (1024 * 1024)
                 message = f"发现 {len(junk_files)} 个垃圾文件\n总大小: {size_mb:.1f} MB\n\n建议手动清理"
             else:
@@ -1106,20 +1614,50 @@ class FileOrganizerGUI:
     def tray_empty_recycle(self, icon=None, item=None):
         """托盘菜单项：清空回收站 (Windows特定)
         
-        使用winshell库来清空回收站
+        直接调用 SHEmptyRecycleBinW 系统API清空回收站，无法调用或调用失败时退回使用winshell库
+        清空操作可能耗时较长，因此在后台线程中执行，完成后再显示通知
         """
-        try:
-            # 导入winshell库（仅在需要时）
-            import winshell
-            # 调用清空回收站功能，不显示确认对话框、进度和声音
-            winshell.recycle_bin().empty(confirm=False, show_progress=False, sound=False)
-            self.show_notification("清理完成", "回收站已清空")
-        except ImportError:
-            # 如果winshell未安装，则提示用户
-            self.show_notification("错误", "需要安装winshell模块 (pip install winshell)")
-        except Exception as e:
-            self.logger.error(f"清理回收站时出错: {e}")
-            self.show_notification("错误", f"清理回收站失败: {e}")
+        def empty_recycle_bin():
+            try:
+                try:
+                    # 通过ctypes调用系统API，无需导入winshell和COM封装
+                    shell32 = ctypes.windll.shell32
+                except (AttributeError, OSError):
+                    # 非Windows平台或无法加载shell32时使用winshell
+                    shell32 = None
+                    
+                error = None
+                if shell32 is not None:
+                    # 不显示确认对话框、进度和声音
+                    hr = shell32.SHEmptyRecycleBinW(None, None, SHERB_SILENT) & 0xFFFFFFFF
+                    if hr == E_UNEXPECTED:
+                        # 回收站本来就是空的，不算失败
+                        self.show_notification("清理完成", "回收站已为空")
+                        return
+                    if hr != 0:
+                        error = f"SHEmptyRecycleBinW 返回 0x{hr:08X}"
+                        self.logger.warning(f"{error}，尝试使用winshell清空回收站")
+                        
+                if shell32 is None or error is not None:
+                    try:
+                        # 导入winshell库（仅在需要时）
+                        import winshell
+                    except ImportError:
+                        # 系统API调用失败且没有winshell时，报告原始错误
+                        if error is not None:
+                            raise OSError(error)
+                        # 如果winshell未安装，则提示用户
+                        self.show_notification("错误", "需要安装winshell模块 (pip install winshell)")
+                        return
+                    winshell.recycle_bin().empty(confirm=False, show_progress=False, sound=False)
+                    
+                self.show_notification("清理完成", "回收站已清空")
+            except Exception as e:
+                self.logger.error(f"清理回收站时出错: {e}")
+                self.show_notification("错误", f"清理回收站失败: {e}")
+                
+        # 在后台线程中清空回收站，避免阻塞界面
+        threading.Thread(target=empty_recycle_bin, daemon=True).start()
             
     def tray_clean_temp(self, icon=None, item=None):
         """托盘菜单项：清理系统临时文件
@@ -1128,113 +1666,370 @@ class FileOrganizerGUI:
         """
         try:
             # 获取系统临时文件夹路径
-            import tempfile
             temp_dir = tempfile.gettempdir()
             
             # 初始化清理计数器
             cleaned_count = 0
             cleaned_size = 0
             
-            # 遍历临时文件夹中的所有项目
-            for item in os.listdir(temp_dir):
-                item_path = os.path.join(temp_dir, item)
-                try:
-                    # 只处理文件
-                    if os.path.isfile(item_path):
-                        size = os.path.getsize(item_path)
-                        os.remove(item_path)
+            # 遍历临时文件夹，收集所有文件及其大小
+            temp_files = []
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
+                    try:
+                        # 只处理文件
+                        if entry.is_file():
+                            temp_files.append((entry.path, entry.stat().st_size))
+                    except OSError:
+                        continue
+                        
+            # 删除操作主要耗时在系统调用上，使用线程池并行删除；退出程序时取消剩余任务
+            with self._cancellable_pool(TEMP_CLEAN_WORKERS) as executor:
+                for size, removed in executor.map(self._try_remove_file, temp_files):
+                    if removed:
                         cleaned_count += 1
                         cleaned_size += size
-                except Exception:
-                    # 忽略无法删除的文件（可能正在被使用）
-                    continue
-                    
+                        
+            # 程序正在退出时不再显示结果
+            if self._shutdown.is_set():
+                return
+                
             # 构建并显示清理结果通知
             size_mb = cleaned_size / (1024 * 1024)
             message = f"清理完成\n\n删除文件: {cleaned_count} 个\n释放空间: {size_mb:.1f} MB"
             self.show_notification("临时文件清理", message)
             
+        except CancelledError:
+            # 程序正在退出，剩余文件的删除任务已被取消
+            return
         except Exception as e:
             self.logger.error(f"清理临时文件时出错: {e}")
             self.show_notification("错误", f"清理临时文件失败: {e}")
             
+    def _try_remove_file(self, file_info):
+        """删除一个文件
+        
+        Args:
+            file_info (tuple): (文件路径, 文件大小)
+            
+        Returns:
+            tuple: (文件大小, 是否删除成功)；程序正在退出时不再删除，返回失败
+        """
+        path, size = file_info
+        if self._shutdown.is_set():
+            return size, False
+        try:
+            os.remove(path)
+            return size, True
+        except OSError:
+            # 忽略无法删除的文件（可能正在被使用）
+            return size, False
+            
     def tray_find_duplicates(self, icon=None, item=None):
         """托盘菜单项：查找重复文件
         
-        通过计算文件内容的MD5哈希值来查找常用目录中的重复文件
+        先按文件大小分组，只对大小相同的文件计算哈希值来查找常用目录中的重复文件
+        超过大小上限的文件只按大小匹配，不逐字节核对
         """
         try:
-            import hashlib
-            
             # 定义要扫描的路径
-            scan_paths = [
-                os.path.join(os.path.expanduser("~"), "Desktop"),
-                os.path.join(os.path.expanduser("~"), "Downloads"),
-                os.path.join(os.path.expanduser("~"), "Documents")
-            ]
-            
-            # 初始化哈希字典和重复文件列表
-            file_hashes = {}
-            duplicates = []
+            scan_paths = self._scan_paths
             
-            # 遍历路径进行扫描
+            # 第一遍：按文件大小分组
+            size_groups = {}
             for scan_path in scan_paths:
-                if not os.path.exists(scan_path):
+                if not self._path_exists_cached(scan_path):
                     continue
                     
-                for item in os.listdir(scan_path):
-                    item_path = os.path.join(scan_path, item)
-                    if os.path.isfile(item_path):
+                with os.scandir(scan_path) as entries:
+                    for entry in entries:
                         try:
-                            # 读取文件内容并计算MD5哈希
-                            with open(item_path, 'rb') as f:
-                                file_hash = hashlib.md5(f.read()).hexdigest()
-                                
-                            # 检查哈希是否已存在
-                            if file_hash in file_hashes:
-                                duplicates.append((item_path, file_hashes[file_hash]))
-                            else:
-                                file_hashes[file_hash] = item_path
-                        except Exception:
-                            # 忽略无法读取的文件
+                            if not entry.is_file():
+                                continue
+                            size = entry.stat().st_size
+                        except OSError:
+                            # 忽略无法访问的文件
                             continue
-                            
+                        size_groups.setdefault(size, []).append(entry.path)
+                        
+            # 第二遍：只对大小相同的文件计算哈希
+            duplicates, unverified_groups, max_hash_bytes = self._hash_duplicate_groups(size_groups)
+            
             # 构建并显示扫描结果通知
-            if duplicates:
-                message = f"发现 {len(duplicates)} 组重复文件\n\n建议手动检查和删除"
-            else:
-                message = "未发现重复文件"
+            message = self._describe_duplicates(duplicates, unverified_groups, max_hash_bytes)
+            # 日志与通知使用同一段描述，计数单位保持一致
+            self.logger.info(f"重复文件扫描: {message}")
+            if duplicates or unverified_groups:
+                message += "\n\n建议手动检查和删除"
                 
             self.show_notification("重复文件扫描", message)
             
+        except CancelledError:
+            # 程序正在退出，放弃本次扫描
+            return
         except Exception as e:
             self.logger.error(f"查找重复文件时出错: {e}")
             self.show_notification("错误", f"查找重复文件失败: {e}")
             
+    def _hash_duplicate_groups(self, size_groups):
+        """对大小相同的文件计算哈希，找出内容重复的文件
+        
+        Args:
+            size_groups (dict): 文件大小到文件路径列表的映射
+            
+        Returns:
+            tuple: (重复文件对列表, 未核对的超大文件组数, 哈希核对的大小上限)
+            
+        Raises:
+            CancelledError: 扫描期间程序开始退出
+        """
+        # 参与哈希核对的单个文件大小上限
+        max_hash_bytes = self.config_manager.get_setting(
+            'advanced.max_duplicate_hash_size', MAX_HASH_BYTES)
+        
+        # 收集需要核对内容的候选文件
+        candidates = []
+        unverified_groups = 0
+        for size, paths in size_groups.items():
+            if len(paths) < 2:
+                continue
+                
+            # 超大文件只按大小报告，避免长时间读取
+            if size > max_hash_bytes:
+                unverified_groups += 1
+                continue
+                
+            candidates.extend((size, item_path) for item_path in paths)
+            
+        # 读取和哈希计算会释放GIL，使用线程池并行处理；退出程序时取消剩余任务
+        with self._cancellable_pool(os.cpu_count()) as executor:
+            # 先按 (大小, 文件头) 分组，头部不同的文件无需计算完整哈希
+            head_groups = {}
+            heads = executor.map(self._try_read_head, (path for _, path in candidates))
+            for (size, item_path), head in zip(candidates, heads):
+                # 忽略无法读取的文件
+                if head is None:
+                    continue
+                head_groups.setdefault((size, head), []).append(item_path)
+                
+            # 文件不超过头部长度时，头部即完整内容，直接作为比较键
+            to_hash = []
+            file_keys = []
+            for (size, head), paths in head_groups.items():
+                if len(paths) < 2:
+                    continue
+                if size <= HASH_HEAD_BYTES:
+                    file_keys.extend(((size, head), path) for path in paths)
+                else:
+                    to_hash.extend((size, path) for path in paths)
+                    
+            results = executor.map(self._try_hash_file, (path for _, path in to_hash))
+            for (size, item_path), file_hash in zip(to_hash, results):
+                if file_hash is not None:
+                    file_keys.append(((size, file_hash), item_path))
+                    
+        # 程序正在退出时结果不完整，交给调用方放弃本次扫描
+        if self._shutdown.is_set():
+            raise CancelledError()
+            
+        # 在当前线程中汇总结果，无需加锁
+        duplicates = []
+        seen = {}
+        for key, item_path in file_keys:
+            if key in seen:
+                duplicates.append((item_path, seen[key]))
+            else:
+                seen[key] = item_path
+                    
+        return duplicates, unverified_groups, max_hash_bytes
+        
+    def _try_read_head(self, path):
+        """读取文件开头的 HASH_HEAD_BYTES 个字节，无法读取或程序正在退出时返回None"""
+        if self._shutdown.is_set():
+            return None
+        try:
+            with open(path, 'rb', buffering=0) as f:
+                return f.read(HASH_HEAD_BYTES)
+        except OSError:
+            return None
+            
+    def _try_hash_file(self, path):
+        """计算文件哈希值，无法读取或程序正在退出时返回None"""
+        if self._shutdown.is_set():
+            return None
+        try:
+            return self._hash_file(path)
+        except OSError:
+            return None
+            
+    def _hash_file(self, path):
+        """计算文件内容的哈希值，避免一次性把整个文件读入内存
+        
+        查找重复文件不需要加密哈希：安装了xxhash时使用更快的XXH3-128，否则使用BLAKE2b
+        每读取一块都检查退出信号，大文件也不会拖延程序退出
+        （因此不使用无法中途停止的 hashlib.file_digest）
+        
+        Args:
+            path (str): 文件路径
+            
+        Returns:
+            bytes or None: 文件的哈希摘要，程序正在退出时返回None
+        """
+        file_hash = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b()
+        with open(path, 'rb', buffering=0) as f:
+            # 复用同一块缓冲区读取，内存占用与文件大小无关
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                if self._shutdown.is_set():
+                    return None
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                file_hash.update(view[:size])
+        return file_hash.digest()
+        
+    def _describe_duplicates(self, duplicates, unverified_groups, max_hash_bytes):
+        """生成重复文件扫描结果的描述文字
+        
+        统一以“组”为单位计数：duplicates 中每个多余副本占一项，
+        同一组的副本都指向该组第一个被发现的文件，按它去重即得到组数
+        """
+        duplicate_groups = len({original for _, original in duplicates})
+        if unverified_groups:
+            limit_gb = max_hash_bytes / (1024 ** 3)
+            return (f"发现 {duplicate_groups + unverified_groups} 组大小相同的文件"
+                    f"（其中 {unverified_groups} 组大于 {limit_gb:g}GB，未逐字节核对）")
+        if duplicate_groups:
+            return f"发现 {duplicate_groups} 组重复文件"
+        return "未发现重复文件"
+        
+    def tray_scan_all(self, icon=None, item=None):
+        """托盘菜单项：全面扫描
+        
+        每个常用目录只遍历一次，同时完成垃圾文件匹配和重复文件的大小分组，
+        再统计系统临时文件夹中的文件，最后汇总显示三项扫描结果（不删除任何文件）
+        """
+        try:
+            junk_count = 0
+            junk_size = 0
+            size_groups = {}
+            
+            # 单次遍历每个常用目录
+            for scan_path in self._scan_paths:
+                if not self._path_exists_cached(scan_path):
+                    continue
+                    
+                try:
+                    entries = os.scandir(scan_path)
+                except OSError as e:
+                    # 某个目录无法访问时跳过它，继续扫描其他目录
+                    self.logger.debug(f"无法访问目录 {scan_path}: {e}")
+                    continue
+                    
+                with entries:
+                    for entry in entries:
+                        try:
+                            if not entry.is_file():
+                                continue
+                            size = entry.stat().st_size
+                        except OSError:
+                            continue
+                            
+                        # 垃圾文件匹配
+                        if is_junk_file_name(entry.name):
+                            junk_count += 1
+                            junk_size += size
+                        # 重复文件的大小分组
+                        size_groups.setdefault(size, []).append(entry.path)
+                        
+            duplicates, unverified_groups, max_hash_bytes = self._hash_duplicate_groups(size_groups)
+            
+            # 统计系统临时文件夹中的文件
+            temp_count = 0
+            temp_size = 0
+            temp_dir = tempfile.gettempdir()
+            try:
+                entries = os.scandir(temp_dir)
+            except OSError as e:
+                # 临时文件夹无法访问时按0个文件统计，不影响其他两项结果
+                self.logger.debug(f"无法访问目录 {temp_dir}: {e}")
+            else:
+                with entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                temp_size += entry.stat().st_size
+                                temp_count += 1
+                        except OSError:
+                            continue
+                        
+            # 构建并显示汇总通知
+            message = (f"垃圾文件: {junk_count} 个，共 {junk_size / (1024 * 1024):.1f} MB\n"
+                       f"重复文件: {self._describe_duplicates(duplicates, unverified_groups, max_hash_bytes)}\n"
+                       f"临时文件: {temp_count} 个，共 {temp_size / (1024 * 1024):.1f} MB")
+            self.show_notification("全面扫描", message)
+            
+        except CancelledError:
+            # 程序正在退出，放弃本次扫描
+            return
+        except Exception as e:
+            self.logger.error(f"全面扫描时出错: {e}")
+            self.show_notification("错误", f"全面扫描失败: {e}")
+            
     def show_notification(self, title, message):
         """显示一个tkinter的消息提示框
 
-        为了防止阻塞GUI主线程，此方法使用 root.after(0, ...) 
-        将消息框的显示安排到下一个GUI事件循环中执行。
+        短时间内连续产生的通知会先放入队列，由 _flush_notifications
+        在 50 毫秒后统一合并显示，避免连续弹出多个模态对话框阻塞主循环。
 
         Args:
             title (str): 消息框的标题
             message (str): 消息框显示的内容
         """
-        try:
-            # 定义一个内部函数来显示对话框
-            def show_dialog():
-                try:
-                    messagebox.showinfo(title, message)
-                    self.logger.info(f"已显示通知对话框: {title} - {message}")
-                except Exception as e:
-                    self.logger.error(f"显示对话框时出错: {e}")
+        # 程序正在退出时不再显示通知
+        if self._shutdown.is_set():
+            return
             
-            # 使用after方法在主线程中安全地调用GUI更新
-            self.root.after(0, show_dialog)
+        try:
+            # 将通知加入待显示队列（队列本身线程安全，无需加锁）
+            self._pending_notifications.put((title, message))
+            with self._notification_lock:
+                # 如果尚未安排刷新，则在主线程中安排一次合并显示
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
+            self.root.after(50, self._flush_notifications)
             
         except Exception as e:
             self.logger.error(f"安排通知时出错: {e}")
+            
+    def _flush_notifications(self):
+        """合并显示队列中的通知
+        
+        按标题分组，同一标题的多条消息合并为一个对话框显示
+        此方法必须在主线程中调用
+        """
+        # 先重置刷新标志再取出队列，之后加入的通知会重新安排刷新
+        with self._notification_lock:
+            self._flush_scheduled = False
+        
+        # 取出队列中的全部通知，按标题分组，保持首次出现的顺序
+        grouped = {}
+        while True:
+            try:
+                title, message = self._pending_notifications.get_nowait()
+            except queue.Empty:
+                break
+            grouped.setdefault(title, []).append(message)
+            
+        for title, messages in grouped.items():
+            message = "\n\n".join(messages)
+            try:
+                messagebox.showinfo(title, message)
+                self.logger.info(f"已显示通知对话框: {title} - {message}")
+            except Exception as e:
+                self.logger.error(f"显示对话框时出错: {e}")
     
     def run(self):
         """启动并运行GUI主循环
@@ -1246,11 +2041,16 @@ class FileOrganizerGUI:
             # 启动tkinter事件循环
             self.root.mainloop()
         finally:
+            # 无论主循环以何种方式结束，都通知后台线程停止并取消线程池中排队的任务，
+            # 否则解释器退出时会一直等待线程池执行完所有任务（程序不再调用 os._exit 强制退出）
+            self._shutdown.set()
+            self._cancel_pools()
             # 确保在程序退出时停止所有后台服务
             if self.reminder_enabled:
                 self.stop_reminder()
-            if self.tray_icon:
-                self.tray_icon.stop()
+            self._stop_tray()
+            # 刷新并关闭所有日志处理器，确保日志完整写入
+            logging.shutdown()
 
 # --- 配置窗口类 --- #
 
@@ -1268,6 +2068,15 @@ class ConfigWindow:
             config_manager (ConfigManager): 配置管理器实例
         """
         self.config_manager = config_manager
+        self.parent = parent
+        # 后台写入配置文件的结果，由主线程轮询取出
+        self._save_results = queue.SimpleQueue()
+        # 每一行规则对应的 (分类名称, 扩展名列表)，以Treeview项ID为键；
+        # 字典顺序与Treeview行顺序一致，保存时无需读取控件或解析字符串
+        self._rule_by_iid = {}
+        # 规则编辑对话框（首次打开时创建，之后复用）及正在编辑的项
+        self._rule_dialog = None
+        self._editing_iid = None
         
         # 创建顶层窗口
         self.window = tk.Toplevel(parent)
@@ -1319,23 +2128,25 @@ class ConfigWindow:
         ttk.Button(button_frame, text="添加规则", command=self.add_rule).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="编辑规则", command=self.edit_rule).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="删除规则", command=self.delete_rule).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="保存", command=self.save_config).pack(side=tk.RIGHT, padx=5)
+        self._save_button = ttk.Button(button_frame, text="保存", command=self.save_config)
+        self._save_button.pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="取消", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
         
     def load_config(self):
-        """从配置管理器加载规则并显示在Treeview中"""
-        # 获取当前配置
-        # 获取当前的配置字典
-        config = self.config_manager.get_config()
-        # 更新配置中的'file_types'部分
-
-        # 调用ConfigManager保存更新后的配置
-        rules = config.get('file_types', {})
+        """从配置管理器加载规则并显示在Treeview中
         
-        # 将规则逐条插入到Treeview
-        for category, extensions in rules.items():
-            ext_str = ', '.join(extensions)  # 将扩展名列表转换为字符串
-            self.tree.insert('', tk.END, values=(category, ext_str))
+        在窗口首次显示之前调用，此时插入行不会触发重绘，无需暂时隐藏Treeview
+        """
+        # 只读取分类规则，不复制整个配置字典
+        rules = self.config_manager.get_setting('file_types', {})
+        # 先准备好每行的显示文本，再依次插入到Treeview
+        rows = [(category, list(extensions), ', '.join(extensions))
+                for category, extensions in rules.items()]
+        
+        insert = self.tree.insert
+        for category, extensions, ext_str in rows:
+            iid = insert('', tk.END, values=(category, ext_str))
+            self._rule_by_iid[iid] = (category, extensions)
             
     def add_rule(self):
         """处理“添加规则”按钮点击事件，打开编辑对话框"""
@@ -1350,10 +2161,10 @@ class ConfigWindow:
             messagebox.showwarning("警告", "请选择要编辑的规则")
             return
             
-        # 获取选中项的数据并打开编辑对话框
+        # 从缓存中取出选中项的规则并打开编辑对话框，无需读取Treeview的值
         item = selection[0]
-        values = self.tree.item(item, 'values')
-        self.edit_rule_dialog(item, values[0], values[1])
+        category, extensions = self._rule_by_iid[item]
+        self.edit_rule_dialog(item, category, ', '.join(extensions))
         
     def delete_rule(self):
         """处理“删除规则”按钮点击事件，删除选中的规则"""
@@ -1363,19 +2174,41 @@ class ConfigWindow:
             messagebox.showwarning("警告", "请选择要删除的规则")
             return
             
-        if messagebox.askyesno("确认", "确定要删除选中的规则吗？"):
-            self.tree.delete(selection[0])
+        # 支持多选，一次删除所有选中的规则
+        if messagebox.askyesno("确认", f"确定要删除选中的 {len(selection)} 条规则吗？"):
+            self.tree.delete(*selection)
+            for iid in selection:
+                self._rule_by_iid.pop(iid, None)
             
     def edit_rule_dialog(self, item=None, category="", extensions=""):
         """
-        创建并显示用于添加或编辑规则的对话框。
+        显示用于添加或编辑规则的对话框。
+
+        对话框只在第一次打开时创建，之后关闭时隐藏，再次打开时直接复用。
 
         Args:
             item: Treeview中的项，如果是编辑模式则提供，默认为None（添加模式）。
             category (str): 要编辑的分类名称，默认为空字符串。
             extensions (str): 要编辑的扩展名列表（逗号分隔），默认为空字符串。
         """
-        """编辑规则对话框"""
+        if self._rule_dialog is None:
+            self._create_rule_dialog()
+            
+        # 记录正在编辑的项，并填入当前值
+        self._editing_iid = item
+        self._category_entry.delete(0, tk.END)
+        self._category_entry.insert(0, category)
+        self._extensions_entry.delete(0, tk.END)
+        self._extensions_entry.insert(0, extensions)
+        self._rule_error.config(text="")
+        
+        # 显示对话框并捕获所有事件，实现模态对话框效果
+        self._rule_dialog.deiconify()
+        self._rule_dialog.grab_set()
+        self._category_entry.focus_set()
+        
+    def _create_rule_dialog(self):
+        """创建（隐藏的）规则编辑对话框及其中的控件"""
         # 创建一个顶级窗口作为对话框
         dialog = tk.Toplevel(self.window)
         # 设置对话框标题
@@ -1384,81 +2217,138 @@ class ConfigWindow:
         dialog.geometry("400x200")
         # 将对话框设置为父窗口的瞬态窗口，使其显示在父窗口之上
         dialog.transient(self.window)
-        # 捕获所有事件，实现模态对话框效果
-        dialog.grab_set()
+        # 点击窗口关闭按钮时只隐藏对话框，以便下次复用
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_rule_dialog)
+        
+        # 所有控件使用grid按行排列在同一列中，列宽随对话框居中伸展
+        dialog.columnconfigure(0, weight=1)
         
         # 创建“分类名称”标签和输入框
-        # ttk.Label用于显示文本标签
-        # tk.StringVar用于绑定输入框的值，并预设当前分类名称
-        ttk.Label(dialog, text="分类名称:").pack(pady=5)
-        # 创建一个字符串变量，并用传入的category值初始化
-
-        # 创建一个输入框，并将其与字符串变量绑定
-        category_var = tk.StringVar(value=category)
-        ttk.Entry(dialog, textvariable=category_var, width=40).pack(pady=5)
+        ttk.Label(dialog, text="分类名称:").grid(row=0, column=0, pady=5)
+        self._category_entry = ttk.Entry(dialog, width=40)
+        self._category_entry.grid(row=1, column=0, pady=5)
         
         # 创建“文件扩展名”标签和输入框
         # 提示用户扩展名应以逗号分隔
-        ttk.Label(dialog, text="文件扩展名 (用逗号分隔):").pack(pady=5)
-        # 创建一个字符串变量，并用传入的extensions值初始化
-
-        # 创建一个输入框，并将其与字符串变量绑定
-        extensions_var = tk.StringVar(value=extensions)
-        ttk.Entry(dialog, textvariable=extensions_var, width=40).pack(pady=5)
+        ttk.Label(dialog, text="文件扩展名 (用逗号分隔):").grid(row=2, column=0, pady=5)
+        self._extensions_entry = ttk.Entry(dialog, width=40)
+        self._extensions_entry.grid(row=3, column=0, pady=5)
+        
+        # 输入有误时在对话框内直接显示提示，不再弹出模态消息框
+        self._rule_error = ttk.Label(dialog, text="", foreground="red")
+        self._rule_error.grid(row=4, column=0)
         
         # 创建一个框架来容纳“保存”和“取消”按钮
         button_frame = ttk.Frame(dialog)
-        button_frame.pack(pady=20)
-        
-        def save_rule():
-            """定义在对话框中点击“保存”按钮时执行的内部函数"""
-            # 获取并清理分类名称和扩展名输入
-            cat = category_var.get().strip()
-
-            ext = extensions_var.get().strip()
+        button_frame.grid(row=5, column=0, pady=10)
+        ttk.Button(button_frame, text="保存", command=self._save_rule).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="取消", command=self._hide_rule_dialog).grid(row=0, column=1, padx=5)
+        
+        self._rule_dialog = dialog
+        
+    def _hide_rule_dialog(self):
+        """隐藏规则编辑对话框并释放事件捕获"""
+        self._rule_dialog.grab_release()
+        self._rule_dialog.withdraw()
+        self._editing_iid = None
+        
+    def _save_rule(self):
+        """在对话框中点击“保存”按钮时，将输入的规则写入Treeview"""
+        # 获取并清理分类名称和扩展名输入
+        cat = self._category_entry.get().strip()
+        ext = self._extensions_entry.get().strip()
+        
+        # 检查输入是否为空
+        if not cat or not ext:
+            self._rule_error.config(text="请填写完整信息")
+            return
             
-            # 检查输入是否为空
-            if not cat or not ext:
-                messagebox.showerror("错误", "请填写完整信息")
-                return
-                return
-                
-            # 如果item存在，则表示是编辑模式，更新现有规则
-            if item:
-                self.tree.item(item, values=(cat, ext))
-            # 否则是添加模式，插入新规则
-            else:
-                self.tree.insert('', tk.END, values=(cat, ext))
-                
-            # 保存后销毁对话框
-            dialog.destroy()
+        # 将扩展名字符串解析为列表，只在这里解析一次
+        ext_list = [e for e in EXTENSION_SPLIT_RE.split(ext) if e]
+        # 只输入了分隔符（如 "," 或 " , "）时没有任何扩展名，不能保存为规则
+        if not ext_list:
+            self._rule_error.config(text="请至少填写一个扩展名")
+            return
+        
+        # 校验每个扩展名，遇到第一个不合法的即停止
+        invalid = next((e for e in ext_list if not EXTENSION_RE.fullmatch(e)), None)
+        if invalid is not None:
+            self._rule_error.config(text=f"无效的扩展名: {invalid}")
+            return
             
-        # 创建“保存”按钮，并绑定save_rule函数
-        ttk.Button(button_frame, text="保存", command=save_rule).pack(side=tk.LEFT, padx=5)
-        # 创建“取消”按钮，点击时直接销毁对话框
-        ttk.Button(button_frame, text="取消", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        # 统一为以点开头的小写形式，与 ConfigManager.add_file_type_rule 一致
+        ext_list = [e.lower() if e.startswith('.') else '.' + e.lower() for e in ext_list]
+        ext_str = ', '.join(ext_list)
+        
+        # 如果正在编辑已有的项，则更新现有规则
+        item = self._editing_iid
+        if item:
+            self.tree.item(item, values=(cat, ext_str))
+            iid = item
+        # 否则是添加模式，插入新规则
+        else:
+            iid = self.tree.insert('', tk.END, values=(cat, ext_str))
+        self._rule_by_iid[iid] = (cat, ext_list)
+        
+        # 保存后隐藏对话框
+        self._hide_rule_dialog()
         
     def save_config(self):
         """将Treeview中的所有规则保存到配置文件中"""
-        """保存配置"""
-        # 创建一个空字典来存储规则
-        rules = {}
-        # 遍历Treeview中的所有顶级项
-        for item in self.tree.get_children():
-            # 获取每个项的值（分类名称和扩展名）
-            values = self.tree.item(item, 'values')
-            # 提取分类名称
-            category = values[0]
-            # 提取扩展名字符串，并将其分割成列表
-
-            extensions = [ext.strip() for ext in values[1].split(',')]
-            # 将分类和对应的扩展名列表存入字典
-            rules[category] = extensions
+        # 规则直接取自缓存（顺序与Treeview一致），无需逐行读取控件
+        rules = dict(self._rule_by_iid.values())
+        
+        # 直接更新配置管理器中的配置，无需先复制整个配置字典
+        self.config_manager.set_setting('file_types', rules)
+        # 在主线程中序列化配置快照，后台线程只负责写入文本，
+        # 避免与主线程对配置的其他修改（如记录最近路径）同时访问配置字典
+        text = self.config_manager.serialize_config()
+        
+        # 写入完成前禁用保存按钮，避免重复点击同时写入同一个文件
+        self._save_button.state(['disabled'])
+        
+        # 在后台线程中写入文件，避免慢速磁盘阻塞界面；
+        # 不使用守护线程，保证程序退出前写入能够完成
+        threading.Thread(target=self._save_config_thread, args=(text,)).start()
+        # 后台线程不调用任何Tk方法，由主线程轮询写入结果
+        self.parent.after(50, self._poll_save_result)
+        
+    def _save_config_thread(self, text):
+        """在后台线程中写入配置文件，结果放入队列由主线程取出
+        
+        Args:
+            text (str): 已序列化的配置文本
+        """
+        self._save_results.put(self.config_manager.write_config_text(text))
+        
+    def _poll_save_result(self):
+        """在主线程中检查配置是否写入完成，完成后显示结果"""
+        try:
+            ok = self._save_results.get_nowait()
+        except queue.Empty:
+            # 尚未写完，稍后再检查
+            self.parent.after(50, self._poll_save_result)
+            return
             
-        config = self.config_manager.get_config()
-        config['file_types'] = rules
-        self.config_manager.save_config(config)
+        # 写入期间配置窗口可能已被关闭
+        try:
+            if self.window.winfo_exists():
+                self._on_config_saved(ok)
+        except tk.TclError:
+            pass
+            
+    def _on_config_saved(self, ok):
+        """配置写入完成后的处理，此方法必须在主线程中调用
         
+        Args:
+            ok (bool): 是否写入成功
+        """
+        if not ok:
+            # 写入失败时保留窗口并恢复保存按钮，方便用户重试
+            self._save_button.state(['!disabled'])
+            messagebox.showerror("错误", "保存配置失败", parent=self.window)
+            return
+            
         # 显示保存成功的消息提示
         messagebox.showinfo("成功", "配置已保存")
         # 关闭配置窗口
@@ -1467,16 +2357,10 @@ class ConfigWindow:
 
 def main():
     """应用程序的主入口函数"""
-    """主函数"""
-    # 确保日志和配置目录存在，如果不存在则创建
-    # exist_ok=True表示如果目录已存在，不会引发错误
-    os.makedirs("logs", exist_ok=True)
-
-    os.makedirs("config", exist_ok=True)
+    # 日志和配置目录分别由 setup_logger 和 ConfigManager 在初始化时按需创建，
+    # 这里无需再检查一遍
     
-    # 创建FileOrganizerGUI类的实例
-
-    # 运行应用程序的主事件循环
+    # 创建FileOrganizerGUI类的实例并运行主事件循环
     app = FileOrganizerGUI()
     app.run()
 